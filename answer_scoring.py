@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from question_dedupe import vectorize
+from skill_matcher import match_skills
+
+
+def score_answer(question, answer, skills=(), model_scorer=None):
+    """Score one answer
+
+    relevance is the cosine similarity between the answer's and the
+    question's content words; coverage is the share of expected skills the
+    answer mentions (the skills the question names, else the candidate's
+    tech stack), or None when there are none to look for. model_scorer, if
+    given, is called as model_scorer(question, answer) and should return a
+    number between 0 and 1.
+    """
+    vectors = vectorize([question, answer])
+    relevance = max(0.0, float(vectors[0] @ vectors[1]))
+
+    expected = match_skills(question) or list(skills)
+    mentioned = set(match_skills(answer))
+    keywords = [skill for skill in expected if skill in mentioned]
+    coverage = len(keywords) / len(expected) if expected else None
+
+    parts = [relevance] + ([coverage] if coverage is not None else [])
+    model_score = None
+    if model_scorer is not None:
+        model_score = float(model_scorer(question, answer))
+        parts.append(model_score)
+
+    return {
+        'relevance': relevance,
+        'coverage': coverage,
+        'keywords': keywords,
+        'model_score': model_score,
+        'score': sum(parts) / len(parts),
+    }
+
+
+class AnswerScorer:
+    """Scores answers on a small thread pool so chat turns never wait on it
+
+    At most max_pending answers are queued or running at once. When the
+    pool is saturated, submit() returns None instead of queueing more
+    work; the caller scores those answers later, when it needs the result.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, model_scorer=None):
+        self.model_scorer = model_scorer
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="hirebuddy-scoring")
+        self._slots = threading.BoundedSemaphore(max(1, int(max_pending)))
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'rejected': 0, 'errors': 0}
+
+    def submit(self, question, answer, skills=()):
+        """Queue an answer for scoring and return a Future, or None if the pool is saturated"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            return None
+        try:
+            future = self._executor.submit(self.score, question, answer, skills)
+        except RuntimeError:
+            # Shut down
+            self._slots.release()
+            return None
+        with self._lock:
+            self._stats['submitted'] += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def score(self, question, answer, skills=()):
+        """Score an answer on the calling thread"""
+        return score_answer(question, answer, skills, model_scorer=self.model_scorer)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['pending'] = stats['submitted'] - stats['completed']
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _done(self, future):
+        self._slots.release()
+        with self._lock:
+            self._stats['completed'] += 1
+            if future.exception() is not None:
+                self._stats['errors'] += 1
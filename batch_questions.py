@@ -0,0 +1,247 @@
+"""Generate interview questions for a list of candidates ahead of time
+
+Reads candidate profiles from CSV (with a header row) or JSONL, with the
+fields name, email, tech_stack, years_experience and job_role (plus an
+optional id), and appends one JSON line per candidate to the output file as
+soon as it is done:
+
+    python batch_questions.py candidates.csv pregenerated.jsonl --workers 4
+    python batch_questions.py candidates.jsonl pregenerated.jsonl --template-only
+
+Each worker process loads the model once. The output doubles as the
+checkpoint: rerunning the same command skips candidates already in it.
+Point the app at the file with HIREBUDDY_PREGENERATED=pregenerated.jsonl and
+those candidates, matched by email and profile, get their questions without
+waiting on generation.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from question_cache import make_cache_key
+from question_source import generate_questions, get_question_filter, get_questions_for_tech_stack
+
+PROFILE_FIELDS = ('tech_stack', 'years_experience', 'job_role')
+
+# Set in each worker process by _init_worker
+_ai_model = None
+
+
+def read_profiles(path):
+    """Yield candidate profiles from a CSV or JSONL file"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = ({k.strip(): (v or "").strip() for k, v in row.items() if k} for row in csv.DictReader(f))
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row_number, row in enumerate(rows, 1):
+            missing = [field for field in PROFILE_FIELDS if not row.get(field)]
+            if missing:
+                raise ValueError(f"{path}: profile {row_number} is missing {', '.join(missing)}")
+            row['id'] = str(row.get('id') or row.get('email') or f"row-{row_number}")
+            yield row
+
+
+def profile_key(profile):
+    return make_cache_key(profile['tech_stack'], profile['years_experience'], profile['job_role'])
+
+
+def load_checkpoint(path):
+    """Ids already in the output file; drops a partly written last line left by an interrupted run"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        valid_end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)['id'])
+            except (ValueError, KeyError):
+                break
+            valid_end += len(line)
+        f.truncate(valid_end)
+    return done
+
+
+def _init_worker(template_only, backend, num_threads, draft_model):
+    """Load the model once per worker process"""
+    global _ai_model
+    if template_only:
+        return
+
+    from inference_worker import InferenceWorker
+    from model_service import load_ai_model
+    from question_stopping import question_stopping_criteria
+
+    generator = load_ai_model(backend=backend, num_threads=num_threads, draft_model=draft_model)
+    # One request at a time per process, but with the same early stop as the app
+    _ai_model = InferenceWorker(
+        generator,
+        max_batch_size=1,
+        max_wait_ms=0,
+        stopping_criteria_factory=lambda prompt_length: question_stopping_criteria(
+            generator.tokenizer, prompt_length, accept=get_question_filter().accepts
+        )
+    )
+
+
+def _generate(profile):
+    """Questions for one profile, falling back to the templates if the model fails"""
+    start = time.perf_counter()
+    args = (profile['tech_stack'], profile['years_experience'])
+    error = None
+    if _ai_model is None:
+        questions, source = get_questions_for_tech_stack(*args), 'templates'
+    else:
+        try:
+            questions, source = generate_questions(*args, profile['job_role'], _ai_model), 'model'
+        except Exception as e:
+            questions, source, error = get_questions_for_tech_stack(*args), 'templates', str(e)
+    return {
+        'id': profile['id'],
+        'email': profile.get('email', ''),
+        'name': profile.get('name', ''),
+        'key': profile_key(profile),
+        'tech_stack': profile['tech_stack'],
+        'years_experience': profile['years_experience'],
+        'job_role': profile['job_role'],
+        'questions': questions,
+        'source': source,
+        'error': error,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+class PregeneratedQuestions:
+    """Question sets from a batch output file, looked up by candidate email and profile
+
+    Only the listed candidates get their sets; anyone else with the same
+    profile goes through the question cache's variants as usual, so common
+    profiles don't all get one identical set.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._by_email = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line of a run that is still going
+                    continue
+                if record.get('questions') and record.get('email'):
+                    self._by_email[(record['email'].strip().lower(), record['key'])] = record['questions']
+
+    def __len__(self):
+        return len(self._by_email)
+
+    def lookup(self, candidate_data):
+        """Questions generated for this candidate (same email and profile), else None"""
+        email = candidate_data.get('email', '').strip().lower()
+        if not email:
+            return None
+        questions = self._by_email.get((email, profile_key(candidate_data)))
+        return list(questions) if questions else None
+
+
+class _Progress:
+    def __init__(self, total, interval):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.questions = 0
+        self.fallbacks = 0
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def add(self, record):
+        self.done += 1
+        self.questions += len(record['questions'])
+        self.fallbacks += record['error'] is not None
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.report(file=sys.stderr)
+
+    def report(self, file=sys.stdout):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate else float("inf")
+        print(
+            f"{self.done}/{self.total} candidates in {elapsed:.1f}s: {rate:.2f} candidates/s, "
+            f"{self.questions / elapsed:.1f} questions/s, {self.fallbacks} template fallbacks, ETA {eta:.0f}s",
+            file=file
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate HireBuddy interview questions in bulk")
+    parser.add_argument("source", help="CSV or JSONL file of candidate profiles")
+    parser.add_argument("output", help="JSONL file to append results to (resumed if it exists)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--threads-per-worker", type=int, default=0,
+                        help="torch threads per worker (default: CPU count / workers)")
+    parser.add_argument("--backend", default=None, help="model backend (default: HIREBUDDY_MODEL_BACKEND)")
+    parser.add_argument("--draft-model", default=None,
+                        help="draft model for assisted decoding, e.g. distilgpt2 (default: HIREBUDDY_DRAFT_MODEL)")
+    parser.add_argument("--template-only", action="store_true", help="use template questions, no model")
+    parser.add_argument("--sync-every", type=int, default=20, help="fsync the output every N candidates")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    done = load_checkpoint(args.output)
+    profiles = [profile for profile in read_profiles(args.source) if profile['id'] not in done]
+    if done:
+        print(f"Resuming: {len(done)} candidates already in {args.output}")
+    if not profiles:
+        print("Nothing to do")
+        return 0
+
+    workers = max(1, min(args.workers, len(profiles)))
+    num_threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    progress = _Progress(len(profiles), args.report_every)
+
+    # spawn, not fork: torch's thread pools don't survive a fork
+    context = multiprocessing.get_context("spawn")
+    with open(args.output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(args.template_only, args.backend, num_threads, args.draft_model)
+    ) as pool:
+        # Keep a couple of profiles queued per worker rather than pickling the whole list up front
+        remaining = iter(profiles)
+        pending = set()
+        while True:
+            while len(pending) < workers * 2:
+                profile = next(remaining, None)
+                if profile is None:
+                    break
+                pending.add(pool.submit(_generate, profile))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                progress.add(record)
+                if progress.done % args.sync_every == 0:
+                    os.fsync(out.fileno())
+        out.flush()
+        os.fsync(out.fileno())
+
+    progress.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Compare CPU inference backends: load time, decode tokens/sec and resident memory
+
+Usage:
+    python benchmarks/bench_backends.py [--backends eager,int8,onnx,compile] [--threads 4]
+
+Each backend runs in its own subprocess so load time and peak RSS are not
+polluted by the previous backend.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from model_backends import BACKENDS, load_model
+from question_parser import build_question_prompt
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def run_backend(args):
+    """Measure a single backend (runs inside the subprocess)"""
+    start = time.perf_counter()
+    model, tokenizer = load_model(args.worker, args.model, num_threads=args.threads)
+    load_s = time.perf_counter() - start
+
+    prompt = build_question_prompt("Python, MySQL, NLP", "3-5 years", "ML Engineer")
+    inputs = tokenizer(prompt, return_tensors="pt")
+    generate_kwargs = dict(
+        max_new_tokens=args.new_tokens,
+        min_new_tokens=args.new_tokens,
+        do_sample=False,
+        pad_token_id=tokenizer.eos_token_id
+    )
+
+    with torch.no_grad():
+        # Warm-up absorbs torch.compile tracing and ONNX session start-up
+        model.generate(**inputs, **generate_kwargs)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            model.generate(**inputs, **generate_kwargs)
+        elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'backend': args.worker,
+        'load_s': load_s,
+        'tokens_per_s': args.new_tokens * args.runs / elapsed,
+        'rss_mb': peak_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--model", default="gpt2")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args)
+        return
+
+    print(f"{'backend':<10} {'load (s)':>9} {'tokens/s':>9} {'peak RSS (MB)':>14}")
+    for backend in args.backends.split(","):
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--worker", backend,
+            "--model", args.model,
+            "--threads", str(args.threads),
+            "--new-tokens", str(args.new_tokens),
+            "--runs", str(args.runs),
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+            print(f"{backend:<10} {error}")
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{backend:<10} {stats['load_s']:>9.2f} {stats['tokens_per_s']:>9.1f} {stats['rss_mb']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
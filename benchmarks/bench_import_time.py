@@ -0,0 +1,78 @@
+"""Import-time breakdown of the app's startup path, with a regression guard
+
+Usage:
+    python benchmarks/bench_import_time.py [--module chatbot_app] [--budget-ms 1500] [--top 15]
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+prints the slowest imports and exits non-zero if a heavy ML package is
+imported at startup or the total exceeds --budget-ms.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that must only be imported when the model is actually loaded
+FORBIDDEN = ('torch', 'transformers', 'optimum', 'onnxruntime')
+
+
+def measure(module):
+    """Return [(cumulative_us, self_us, depth, name)] for one fresh import of module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="chatbot_app")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # Keep the fastest run; the others mostly measure a cold disk cache
+    best = None
+    for _ in range(args.runs):
+        rows = measure(args.module)
+        total = sum(row[0] for row in rows if row[2] == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total_us, rows = best
+
+    print(f"import {args.module}: {total_us / 1000:.1f} ms total")
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for cumulative_us, self_us, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {'  ' * depth}{name}")
+
+    failures = []
+    heavy = sorted({name for _, _, _, name in rows if name.split(".")[0] in FORBIDDEN})
+    if heavy:
+        failures.append(f"heavy ML packages imported at startup: {', '.join(heavy[:5])}")
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        failures.append(f"import took {total_us / 1000:.1f} ms, budget is {args.budget_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
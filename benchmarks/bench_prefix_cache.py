@@ -0,0 +1,98 @@
+"""Compare prompt prefill time with and without the prompt prefix cache
+
+Usage:
+    python benchmarks/bench_prefix_cache.py [--model gpt2] [--random-init] [--runs 50]
+
+--random-init builds a randomly initialized GPT-2 sized model so only the
+tokenizer has to be available locally.
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer, GPT2Config, GPT2LMHeadModel
+
+from prefix_cache import PrefixCache
+from question_parser import QUESTION_PROMPT_PREFIX, build_question_prompt
+
+PROFILES = [
+    ("Python, MySQL, NLP", "3-5 years", "ML Engineer"),
+    ("React, JavaScript", "1-2 years", "Frontend Developer"),
+    ("Java, AWS", "7-10 years", "Tech Lead"),
+    ("SQL", "0-1 years", "Database Administrator"),
+]
+
+
+def load(args):
+    # The tokenizer files are small; only the weights are skipped with --random-init
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    if args.random_init:
+        model = GPT2LMHeadModel(GPT2Config())
+    else:
+        model = AutoModelForCausalLM.from_pretrained(args.model)
+    model.eval()
+    return model, tokenizer
+
+
+def time_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), sorted(samples)[int(0.95 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="gpt2")
+    parser.add_argument("--random-init", action="store_true")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model, tokenizer = load(args)
+    start = time.perf_counter()
+    cache = PrefixCache(model, tokenizer, QUESTION_PROMPT_PREFIX)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"prefix tokens: {cache.prefix_ids.shape[1]}, prefix cache built in {build_ms:.1f} ms")
+    print(f"{'profile':<40} {'prompt':>6} {'full p50':>9} {'cached p50':>11} {'speedup':>8} {'max diff':>9}")
+
+    with torch.no_grad():
+        for profile in PROFILES:
+            prompt = build_question_prompt(*profile)
+            full_ids = tokenizer(prompt, return_tensors="pt").input_ids
+            inputs = cache.prepare(prompt)
+            suffix_ids = inputs['input_ids'][:, cache.prefix_ids.shape[1]:]
+
+            def full():
+                return model(full_ids, use_cache=True).logits
+
+            def cached():
+                return model(
+                    suffix_ids,
+                    past_key_values=copy.deepcopy(cache.past_key_values),
+                    attention_mask=inputs['attention_mask'],
+                    use_cache=True
+                ).logits
+
+            # Both paths must predict the same next token distribution
+            diff = (full()[:, -1] - cached()[:, -1]).abs().max().item()
+            full_p50, _ = time_ms(full, args.runs)
+            cached_p50, _ = time_ms(cached, args.runs)
+            label = ", ".join(profile)[:40]
+            print(f"{label:<40} {full_ids.shape[1]:>6} {full_p50:>8.2f}ms {cached_p50:>10.2f}ms "
+                  f"{full_p50 / cached_p50:>7.2f}x {diff:>9.2e}")
+
+
+if __name__ == "__main__":
+    main()
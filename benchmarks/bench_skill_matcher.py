@@ -0,0 +1,84 @@
+"""Compare the indexed skill matcher with the old substring scan
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--stacks 5000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SKILL_ALIASES, match_skills
+
+TEMPLATE_KEYS = ['python', 'mysql', 'nlp', 'javascript', 'react', 'aws', 'java', 'sql', 'general']
+NOISE = ['Docker', 'Kubernetes', 'Git', 'Linux', 'C++', 'Go', 'Rust', 'HTML5', 'CSS', 'GraphQL', 'Kafka', 'Redis']
+SEPARATORS = [', ', ' / ', '; ', ' and ', ' ']
+
+
+def substring_scan(tech_stack):
+    """The matcher get_questions_for_tech_stack used before the index"""
+    tech_stack_lower = tech_stack.lower()
+    return [key for key in TEMPLATE_KEYS if key != 'general' and key in tech_stack_lower]
+
+
+ALIAS_KEYS = [(alias, skill) for skill, names in SKILL_ALIASES.items() for alias in names]
+
+
+def alias_substring_scan(tech_stack):
+    """Substring scan over every alias, which is what the old approach needs to reach the same coverage"""
+    tech_stack_lower = tech_stack.lower()
+    return list({skill: None for alias, skill in ALIAS_KEYS if alias in tech_stack_lower})
+
+
+def random_stacks(count, rng):
+    aliases = [(skill, alias) for skill, names in SKILL_ALIASES.items() for alias in names]
+    stacks = []
+    for _ in range(count):
+        picks = rng.sample(aliases, rng.randint(1, 4))
+        words = [rng.choice([alias, alias.upper(), alias.title()]) for _, alias in picks]
+        words += rng.sample(NOISE, rng.randint(0, 3))
+        rng.shuffle(words)
+        stacks.append((rng.choice(SEPARATORS).join(words), {skill for skill, _ in picks}))
+    return stacks
+
+
+def bench(fn, stacks, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text, _ in stacks:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def accuracy(fn, stacks):
+    exact = sum(set(fn(text)) == expected for text, expected in stacks)
+    return exact / len(stacks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stacks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stacks = random_stacks(args.stacks, random.Random(args.seed))
+    print(f"{args.stacks} generated tech stacks, e.g. {stacks[0][0]!r}")
+    print(f"{'matcher':<16} {'us/stack':>9} {'exact match':>12}")
+    matchers = [
+        ('substring scan', substring_scan),
+        ('alias substring', alias_substring_scan),
+        ('phrase index', match_skills),
+    ]
+    for name, fn in matchers:
+        elapsed = bench(fn, stacks)
+        print(f"{name:<16} {elapsed / len(stacks) * 1e6:>9.2f} {accuracy(fn, stacks):>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Compare plain decoding with assisted (speculative) decoding from a draft model
+
+Usage:
+    python benchmarks/bench_speculative.py [--runs 5] [--new-tokens 128] [--draft-tokens 5]
+    python benchmarks/bench_speculative.py --main gpt2 --draft distilgpt2
+
+By default both models are small randomly initialized GPT-2 configs, so the
+benchmark runs offline without downloading weights. Two drafts are tried:
+a separate small model, and the main model's first --draft-layers layers
+with the same weights. The second is the setup where random weights still
+agree often enough to show acceptance. Real checkpoints (--main/--draft)
+give representative numbers.
+
+Acceptance rate is the share of proposed draft tokens that the main model
+kept. It is counted from forward passes: every main model pass accepts some
+draft tokens and then adds one token of its own.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForCausalLM, GPT2Config, GPT2LMHeadModel
+
+from model_backends import configure_threads
+
+# Roughly the length of the question prompt in GPT-2 tokens
+PROMPT_TOKENS = 120
+
+
+def random_model(n_layer, n_embd, n_head, seed):
+    torch.manual_seed(seed)
+    return GPT2LMHeadModel(GPT2Config(n_layer=n_layer, n_embd=n_embd, n_head=n_head)).eval()
+
+
+def truncated_draft(model, n_layer):
+    """The main model's embeddings, first n_layer blocks and head, as a standalone model"""
+    config = GPT2Config(**{**model.config.to_dict(), 'n_layer': n_layer})
+    draft = GPT2LMHeadModel(config).eval()
+    # Keys for the blocks beyond n_layer are left out
+    draft.load_state_dict(model.state_dict(), strict=False)
+    return draft
+
+
+class PassCounter:
+    """Counts forward passes of a model"""
+
+    def __init__(self, model):
+        self.calls = 0
+        self._handle = model.register_forward_hook(self._hook)
+
+    def _hook(self, module, inputs, output):
+        self.calls += 1
+
+    def reset(self):
+        self.calls = 0
+
+    def remove(self):
+        self._handle.remove()
+
+
+def run(model, input_ids, args, draft=None):
+    """Tokens/sec and acceptance rate over args.runs generations"""
+    kwargs = dict(
+        max_new_tokens=args.new_tokens,
+        # Random weights emit EOS early; forcing the full length keeps runs comparable
+        min_new_tokens=args.new_tokens,
+        do_sample=args.sample,
+        pad_token_id=0,
+    )
+    if draft is not None:
+        kwargs['assistant_model'] = draft
+
+    main_passes = PassCounter(model)
+    draft_passes = PassCounter(draft) if draft is not None else None
+    rates, accepted, proposed = [], 0, 0
+    try:
+        for i in range(args.runs + 1):
+            if draft is not None:
+                # generate() adapts num_assistant_tokens in place; start every run from the same setting
+                draft.generation_config.num_assistant_tokens = args.draft_tokens
+                draft_passes.reset()
+            main_passes.reset()
+            torch.manual_seed(i)
+            start = time.perf_counter()
+            with torch.no_grad():
+                output = model.generate(input_ids, attention_mask=torch.ones_like(input_ids), **kwargs)
+            elapsed = time.perf_counter() - start
+            if i == 0:
+                # Warm-up
+                continue
+            new_tokens = output.shape[-1] - input_ids.shape[-1]
+            rates.append(new_tokens / elapsed)
+            if draft is not None:
+                # Every main pass keeps the accepted draft tokens and adds one token of its own
+                accepted += max(0, new_tokens - main_passes.calls)
+                proposed += draft_passes.calls
+    finally:
+        main_passes.remove()
+        if draft_passes is not None:
+            draft_passes.remove()
+
+    acceptance = accepted / proposed if proposed else None
+    return statistics.median(rates), acceptance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--main", help="main model checkpoint (default: random GPT-2 config)")
+    parser.add_argument("--draft", help="draft model checkpoint (default: random small GPT-2 config)")
+    parser.add_argument("--main-layers", type=int, default=6)
+    parser.add_argument("--main-embd", type=int, default=512)
+    parser.add_argument("--draft-embd", type=int, default=256)
+    parser.add_argument("--draft-layers", type=int, default=2)
+    parser.add_argument("--draft-tokens", type=int, default=5, help="tokens the draft proposes per step")
+    parser.add_argument("--new-tokens", type=int, default=128)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sample", action="store_true", help="sample instead of greedy decoding")
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    configure_threads(args.threads)
+
+    if args.main:
+        model = AutoModelForCausalLM.from_pretrained(args.main).eval()
+    else:
+        model = random_model(args.main_layers, args.main_embd, 8, seed=0)
+
+    drafts = []
+    if args.draft:
+        drafts.append((f"draft {args.draft}", AutoModelForCausalLM.from_pretrained(args.draft).eval()))
+    elif not args.main:
+        drafts.append((
+            f"draft {args.draft_layers}x{args.draft_embd}",
+            random_model(args.draft_layers, args.draft_embd, 4, seed=1)
+        ))
+    if model.config.model_type == "gpt2":
+        drafts.append((f"first {args.draft_layers} layers", truncated_draft(model, args.draft_layers)))
+
+    torch.manual_seed(0)
+    input_ids = torch.randint(0, model.config.vocab_size, (1, PROMPT_TOKENS))
+
+    main_name = args.main or f"random {model.config.n_layer}x{model.config.n_embd}"
+    print(f"main model {main_name}, {args.new_tokens} new tokens, "
+          f"{'sampling' if args.sample else 'greedy'}, {args.draft_tokens} draft tokens per step")
+    print(f"{'decoding':<24} {'tokens/s':>9} {'speedup':>8} {'acceptance':>11}")
+    baseline, _ = run(model, input_ids, args)
+    print(f"{'plain':<24} {baseline:>9.1f} {1.0:>7.2f}x {'-':>11}")
+    for name, draft in drafts:
+        rate, acceptance = run(model, input_ids, args, draft=draft)
+        shown = f"{acceptance:.1%}" if acceptance is not None else "-"
+        print(f"{name:<24} {rate:>9.1f} {rate / baseline:>7.2f}x {shown:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Drive many concurrent interview sessions through the headless InterviewSession
+
+Each session submits a candidate, starts the interview with template (or
+question bank) questions and answers every question until it completes, the
+same path the Streamlit app takes without a model. --generation-ms adds a
+simulated model call per interview start; --stream publishes those questions
+one at a time from a background thread like QuestionStream does.
+--transcripts writes every session's messages through a TranscriptStore and
+--score scores every answer on a background AnswerScorer.
+
+Usage:
+    python benchmarks/load_test_sessions.py [--sessions 1000] [--concurrency 32] [--generation-ms 0] [--stream]
+        [--transcripts /tmp/transcripts.db] [--score]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_scoring import AnswerScorer
+from interview_session import INTERVIEW_COMPLETED, InterviewSession
+from question_source import get_questions_for_tech_stack
+from transcript_store import TranscriptStore
+
+PROFILES = [
+    ("Python, MySQL, NLP", "3-5 years", "ML Engineer"),
+    ("React, JavaScript", "1-2 years", "Frontend Developer"),
+    ("Java, AWS", "7-10 years", "Tech Lead"),
+    ("SQL", "0-1 years", "Database Administrator"),
+]
+
+ANSWERS = [
+    "I would start by profiling the slow path and then cache the results that are reused.",
+    "We used indexes on the join columns and rewrote the query to avoid a full table scan.",
+    "It depends on the workload, but usually I prefer composition over inheritance there.",
+]
+
+
+class SimulatedStream:
+    """Stand-in for QuestionStream that publishes questions evenly over the generation time"""
+
+    def __init__(self, questions, generation_seconds):
+        self.questions = []
+        self.done = False
+        self.error = None
+        self._condition = threading.Condition()
+        self._pending = list(questions)
+        self._interval = generation_seconds / max(len(questions), 1)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        for question in self._pending:
+            time.sleep(self._interval)
+            with self._condition:
+                self.questions = self.questions + [question]
+                self._condition.notify_all()
+        with self._condition:
+            self.done = True
+            self._condition.notify_all()
+
+    def wait_for(self, count, timeout=None):
+        with self._condition:
+            self._condition.wait_for(lambda: self.done or len(self.questions) >= count, timeout=timeout)
+        return len(self.questions) >= count
+
+
+def run_session(index, args, transcript=None, scorer=None):
+    """Run one interview to completion; returns (session, session seconds, per-answer seconds)"""
+    tech_stack, years_experience, job_role = PROFILES[index % len(PROFILES)]
+    rng = random.Random(index)
+    session = InterviewSession(transcript=transcript, scorer=scorer)
+    turns = []
+    start = time.perf_counter()
+
+    session.submit_candidate({
+        'name': f"Candidate {index}",
+        'email': f"candidate{index}@example.com",
+        'phone': "555-0100",
+        'tech_stack': tech_stack,
+        'years_experience': years_experience,
+        'job_role': job_role
+    })
+    questions = get_questions_for_tech_stack(tech_stack, years_experience)
+    if args.stream:
+        stream = SimulatedStream(questions, args.generation_ms / 1000)
+        session.start([], question_stream=stream, fallback_questions=questions)
+    else:
+        if args.generation_ms:
+            time.sleep(args.generation_ms / 1000)
+        session.start(questions)
+
+    while session.conversation_state != INTERVIEW_COMPLETED:
+        if args.think_ms:
+            time.sleep(args.think_ms / 1000)
+        turn_start = time.perf_counter()
+        session.answer(rng.choice(ANSWERS))
+        turns.append(time.perf_counter() - turn_start)
+
+    return session, time.perf_counter() - start, turns
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--generation-ms", type=float, default=0.0, help="simulated question generation time")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="simulated candidate time per answer")
+    parser.add_argument("--stream", action="store_true", help="publish questions one at a time while the interview runs")
+    parser.add_argument("--transcripts", help="SQLite file to append transcripts to")
+    parser.add_argument("--score", action="store_true", help="score answers in the background")
+    parser.add_argument("--scoring-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    # Warm imports and the question source so they don't count against the first sessions
+    run_session(0, argparse.Namespace(stream=False, generation_ms=0, think_ms=0))
+
+    transcript = TranscriptStore(args.transcripts) if args.transcripts else None
+    scorer = AnswerScorer(max_workers=args.scoring_workers) if args.score else None
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: run_session(i, args, transcript, scorer), range(args.sessions)))
+    if transcript is not None:
+        transcript.flush()
+    elapsed = time.perf_counter() - start
+    # The finished sessions are still referenced by results, so this is what they hold on to
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    sessions = [session for session, _, _ in results]
+    durations = [duration for _, duration, _ in results]
+    turns = [turn for _, _, session_turns in results for turn in session_turns]
+    completed = sum(session.conversation_state == INTERVIEW_COMPLETED for session in sessions)
+
+    print(f"{args.sessions} sessions, {args.concurrency} concurrent, "
+          f"{args.generation_ms:g} ms generation{' (streamed)' if args.stream else ''}")
+    print(f"completed:       {completed}/{args.sessions}")
+    print(f"throughput:      {args.sessions / elapsed:.1f} sessions/s, {len(turns) / elapsed:.1f} answers/s")
+    print(f"session latency: p50 {percentile(durations, 50) * 1e3:.2f} ms, "
+          f"p95 {percentile(durations, 95) * 1e3:.2f} ms, p99 {percentile(durations, 99) * 1e3:.2f} ms")
+    print(f"answer latency:  p50 {percentile(turns, 50) * 1e6:.1f} us, "
+          f"p95 {percentile(turns, 95) * 1e6:.1f} us, p99 {percentile(turns, 99) * 1e6:.1f} us, "
+          f"mean {statistics.mean(turns) * 1e6:.1f} us")
+    print(f"memory/session:  {retained / args.sessions / 1024:.1f} KiB retained, "
+          f"peak {peak / 1024 / 1024:.1f} MiB over baseline")
+    if scorer is not None:
+        scorer.close()
+        unscored = sum(record['future'] is None for session in sessions for record in session.answers)
+        print(f"scoring:         {scorer.metrics()}, {unscored} answers left for the summary screen")
+    if transcript is not None:
+        transcript.close()
+        print(f"transcripts:     {args.transcripts}" + (f" (write error: {transcript.error})" if transcript.error else ""))
+
+
+if __name__ == "__main__":
+    main()
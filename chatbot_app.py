@@ -1,9 +1,26 @@
 import streamlit as st
-import random
-import time
-from datetime import datetime
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-import torch
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from question_cache import QuestionCache, make_cache_key, DEFAULT_CACHE_PATH
+from question_parser import build_question_prompt
+from question_stream import QuestionStream
+from question_source import (
+    generate_model_questions, get_question_filter, get_questions_for_tech_stack, pad_with_template_questions
+)
+from skill_matcher import GREETING_MATCHER
+from interview_session import (
+    GREETING, HISTORY_WINDOW, INTERVIEW_COMPLETED, INTERVIEW_READY, INTERVIEWING, InterviewSession, detect_ending
+)
+from transcript_store import get_transcript_store
+from answer_scoring import AnswerScorer
+from batch_questions import PregeneratedQuestions
+from metrics import increment, profiled, snapshot, start_exporter, timed
+from model_registry import READY
+from model_client import ModelServerClient, ModelServerError
+from model_service import (
+    MAX_NEW_TOKENS, GENERATION_TIME_BUDGET, TEMPLATE_ONLY,
+    get_ai_model_registry, get_inference_worker, get_prefix_cache
+)
 
 # Configure page
 st.set_page_config(
@@ -11,235 +28,187 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if 'conversation_state' not in st.session_state:
-    st.session_state.conversation_state = 'greeting'
-if 'candidate_data' not in st.session_state:
-    st.session_state.candidate_data = {}
-if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
-if 'current_question' not in st.session_state:
-    st.session_state.current_question = 0
-if 'interview_questions' not in st.session_state:
-    st.session_state.interview_questions = []
-if 'interview_started' not in st.session_state:
-    st.session_state.interview_started = False
-if 'ai_model' not in st.session_state:
-    st.session_state.ai_model = None
+# Interview transcripts are appended here and survive restarts; set to "" to keep them in memory only
+TRANSCRIPT_PATH = os.environ.get("HIREBUDDY_TRANSCRIPTS", os.path.join(".hirebuddy_cache", "transcripts.db"))
 
-# Load AI model for question generation
+# Messages rendered per "Load earlier messages" click
+HISTORY_PAGE_SIZE = 20
+
+# Answers are scored off the chat turn by a pool shared across sessions
 @st.cache_resource
-def load_ai_model():
-    """Load a lightweight AI model for question generation"""
-    try:
-        # Using GPT-2 small for better performance on M2 MacBook
-        model_name = "gpt2"
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForCausalLM.from_pretrained(model_name)
-        
-        # Set pad token
-        if tokenizer.pad_token is None:
-            tokenizer.pad_token = tokenizer.eos_token
-        
-        # Create text generation pipeline
-        generator = pipeline(
-            "text-generation",
-            model=model,
-            tokenizer=tokenizer,
-            max_length=200,
-            do_sample=True,
-            temperature=0.8,
-            top_p=0.9,
-            top_k=50,
-            repetition_penalty=1.2,
-            pad_token_id=tokenizer.eos_token_id
-        )
-        return generator
-    except Exception as e:
-        st.error(f"Error loading AI model: {e}")
+def get_answer_scorer():
+    """Process-wide background answer scorer"""
+    return AnswerScorer(
+        max_workers=int(os.environ.get("HIREBUDDY_SCORING_WORKERS", "2")),
+        max_pending=int(os.environ.get("HIREBUDDY_SCORING_QUEUE", "32"))
+    )
+
+# Initialize session state; the interview itself lives in a headless InterviewSession
+if 'interview' not in st.session_state:
+    st.session_state.interview = InterviewSession(
+        transcript=get_transcript_store(TRANSCRIPT_PATH) if TRANSCRIPT_PATH else None,
+        window=int(os.environ.get("HIREBUDDY_HISTORY_WINDOW", HISTORY_WINDOW)),
+        scorer=get_answer_scorer()
+    )
+if 'history_pages' not in st.session_state:
+    st.session_state.history_pages = 0
+
+# Stage timings and counters (HIREBUDDY_METRICS=1), shown in the sidebar with HIREBUDDY_ADMIN=1
+ADMIN_PANEL = os.environ.get("HIREBUDDY_ADMIN", "0") == "1"
+start_exporter()
+
+# Post the first question as soon as it is decoded instead of waiting for all five
+STREAM_QUESTIONS = os.environ.get("HIREBUDDY_STREAM_QUESTIONS", "1") == "1"
+
+# Optional shared model server (see model_server.py), e.g. http://127.0.0.1:8765
+MODEL_SERVER_URL = os.environ.get("HIREBUDDY_MODEL_SERVER", "")
+
+@st.cache_resource
+def get_model_server_client():
+    """Pooled client for the shared model server, or None to use the local model"""
+    if not MODEL_SERVER_URL:
         return None
+    return ModelServerClient(MODEL_SERVER_URL)
 
-# Enhanced question templates (fallback)
-QUESTION_TEMPLATES = {
-    'python': [
-        "Hello! Let's start with Python. Can you explain the difference between lists and tuples in Python? When would you use each?",
-        "Great! Now, how do you handle exceptions in Python? Can you walk me through a try-except block example?",
-        "Interesting! What are Python decorators? Can you show me how to create a custom decorator?",
-        "Excellent! Explain the concept of list comprehensions. Can you write a comprehension that filters even numbers?",
-        "Perfect! How does Python's garbage collection work? What are some memory management best practices you follow?"
-    ],
-    'mysql': [
-        "Hello! Let's discuss databases. Can you explain the difference between INNER JOIN and LEFT JOIN? When would you use each?",
-        "Good! What are database indexes? How do they improve query performance in MySQL?",
-        "Nice! Explain database normalization. What are the different normal forms and why are they important?",
-        "Excellent! What are stored procedures in MySQL? When would you use them over regular queries?",
-        "Great! How do you optimize a slow-running MySQL query? What tools and techniques do you use?"
-    ],
-    'nlp': [
-        "Hello! Let's talk about NLP. Can you explain the difference between stemming and lemmatization?",
-        "Interesting! What are word embeddings? How do Word2Vec and GloVe differ in their approaches?",
-        "Great! Explain the concept of TF-IDF. How is it calculated and when would you use it?",
-        "Excellent! What are n-grams? How do you choose the right n-gram size for different tasks?",
-        "Perfect! Explain sentiment analysis. What approaches would you use for different types of text?"
-    ],
-    'javascript': [
-        "Hello! Let's start with JavaScript. Can you explain the difference between var, let, and const?",
-        "Good! What are closures in JavaScript? Can you provide a practical example of how you'd use them?",
-        "Interesting! How does the event loop work in JavaScript? Can you explain the call stack?",
-        "Great! Explain promises and async/await. How do they differ from traditional callbacks?",
-        "Excellent! What are the differences between == and === in JavaScript? Why is this important?"
-    ],
-    'react': [
-        "Hello! Let's discuss React. Can you explain the component lifecycle? What are the key lifecycle methods?",
-        "Good! What are React hooks? Can you compare useState and useEffect with examples?",
-        "Interesting! How do you manage state in React applications? What's your approach?",
-        "Great! Explain the difference between props and state in React. When do you use each?",
-        "Excellent! What is the Virtual DOM? How does React's reconciliation process work?"
-    ],
-    'aws': [
-        "Hello! Let's talk about AWS. Can you explain the difference between EC2 and Lambda services? When would you use each?",
-        "Good! How would you design a scalable web application on AWS? What services would you include?",
-        "Interesting! What are the different storage options in AWS? Compare S3, EBS, and EFS.",
-        "Great! Explain auto-scaling in AWS. How do you configure it for different scenarios?",
-        "Excellent! How do you ensure security in AWS applications? What services and best practices do you use?"
-    ],
-    'java': [
-        "Hello! Let's discuss Java. Can you explain the main concepts of object-oriented programming in Java?",
-        "Good! What's the difference between abstract classes and interfaces in Java? When would you use each?",
-        "Interesting! How does garbage collection work in Java? What are the different GC algorithms?",
-        "Great! Explain multithreading in Java. How do you handle thread safety in your applications?",
-        "Excellent! What are design patterns in Java? Can you explain the Singleton pattern and its use cases?"
-    ],
-    'sql': [
-        "Hello! Let's talk about SQL. Can you explain the difference between INNER JOIN and LEFT JOIN? When would you use each?",
-        "Good! What are database indexes? How do they improve query performance?",
-        "Interesting! Explain database normalization. What are the different normal forms?",
-        "Great! What are stored procedures? When would you use them over regular queries?",
-        "Excellent! How do you optimize a slow-running SQL query? What's your systematic approach?"
-    ],
-    'general': [
-        "Hello! Let's start with a general question. Can you walk me through a challenging project you've worked on? What made it difficult?",
-        "Interesting! How do you approach debugging a complex issue? What's your systematic process?",
-        "Great! Explain your experience with version control. How do you manage code collaboration in a team?",
-        "Good! What's your approach to code testing? How do you ensure quality in your projects?",
-        "Excellent! How do you stay updated with the latest developments in your field? What resources do you use?"
-    ]
-}
+# Shared cache of generated question sets, warmed from disk on startup
+@st.cache_resource
+def get_question_cache():
+    """Load the process-wide question set cache"""
+    return QuestionCache(path=os.environ.get("HIREBUDDY_QUESTION_CACHE", DEFAULT_CACHE_PATH))
 
-def detect_greeting(text):
-    greetings = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings']
-    return any(greeting in text.lower() for greeting in greetings)
+# Output of batch_questions.py; candidates found in it skip question generation
+PREGENERATED_PATH = os.environ.get("HIREBUDDY_PREGENERATED", "")
+
+@st.cache_resource(max_entries=1)
+def load_pregenerated_questions(path, mtime_ns):
+    """Index the batch output file; mtime_ns makes a rewritten file load again"""
+    return PregeneratedQuestions(path)
+
+def get_pregenerated_questions(candidate_data):
+    """Questions generated ahead of time for this candidate, or None"""
+    if not PREGENERATED_PATH:
+        return None
+    try:
+        mtime_ns = os.stat(PREGENERATED_PATH).st_mtime_ns
+    except OSError:
+        return None
+    return load_pregenerated_questions(PREGENERATED_PATH, mtime_ns).lookup(candidate_data)
 
-def detect_ending(text):
-    endings = ['bye', 'goodbye', 'thank you', 'thanks', 'see you', 'see ya', 'farewell', 'end', 'quit', 'exit']
-    return any(ending in text.lower() for ending in endings)
+def detect_greeting(text):
+    return GREETING_MATCHER.matches(text)
 
 def generate_ai_questions(tech_stack, years_experience, job_role, ai_model):
-    """Generate questions using AI model based on candidate profile"""
+    """Generate questions using AI model based on candidate profile
+
+    Returns (questions, generated), where generated counts the questions
+    that came from the model rather than the templates.
+    """
     if not ai_model:
-        return get_questions_for_tech_stack(tech_stack)
+        increment("question_fallbacks_total", reason="no_model")
+        return get_questions_for_tech_stack(tech_stack, years_experience), 0
     
     try:
-        # Create a detailed prompt based on candidate profile
-        prompt = f"""Generate 5 technical interview questions for a candidate with:
-- Technical Stack: {tech_stack}
-- Years of Experience: {years_experience}
-- Job Role: {job_role}
-
-Create diverse, practical questions that match their experience level. Make them conversational and interview-appropriate.
-
-Questions:"""
-        
-        # Generate questions using AI
-        response = ai_model(
-            prompt,
-            max_length=400,
-            num_return_sequences=1,
-            temperature=0.8,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=ai_model.tokenizer.eos_token_id
-        )
-        
-        generated_text = response[0]['generated_text']
-        
-        # Extract questions from generated text
-        questions = []
-        lines = generated_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line and '?' in line and not line.startswith(prompt.split('\n')[0]):
-                # Clean up the question
-                if line.startswith(('1.', '2.', '3.', '4.', '5.')):
-                    questions.append(line)
-                elif not any(q in line.lower() for q in ['generate', 'questions', 'candidate', 'technical', 'interview']):
-                    if len(questions) < 5:
-                        questions.append(f"{len(questions) + 1}. {line}")
-        
-        # If we don't have enough questions, fill with template questions
-        if len(questions) < 5:
-            template_questions = get_questions_for_tech_stack(tech_stack)
-            for i, tq in enumerate(template_questions):
-                if len(questions) < 5:
-                    questions.append(tq)
-        
-        return questions[:5]
-        
+        questions = generate_model_questions(tech_stack, years_experience, job_role, ai_model)
+        return pad_with_template_questions(questions, tech_stack, years_experience), len(questions)
+    except ModelServerError:
+        # The shared model server is down or timed out; the templates keep the interview going
+        increment("question_fallbacks_total", reason="model_server")
+        return get_questions_for_tech_stack(tech_stack, years_experience), 0
+    except FutureTimeoutError:
+        # The local worker is backed up; don't hold the interview behind it
+        increment("question_fallbacks_total", reason="timeout")
+        return get_questions_for_tech_stack(tech_stack, years_experience), 0
     except Exception as e:
+        increment("question_fallbacks_total", reason="error")
         st.error(f"Error generating AI questions: {e}")
-        return get_questions_for_tech_stack(tech_stack)
+        return get_questions_for_tech_stack(tech_stack, years_experience), 0
 
-def get_questions_for_tech_stack(tech_stack):
-    """Get questions based on tech stack (fallback method)"""
-    tech_stack_lower = tech_stack.lower()
-    
-    # Find matching tech stacks
-    matched_stacks = ['general']
-    for key in QUESTION_TEMPLATES:
-        if key != 'general' and key in tech_stack_lower:
-            matched_stacks.append(key)
-    
-    # Collect questions from matched stacks
-    all_questions = []
-    for stack in matched_stacks:
-        all_questions.extend(QUESTION_TEMPLATES[stack])
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_questions = []
-    for q in all_questions:
-        if q not in seen:
-            seen.add(q)
-            unique_questions.append(q)
-    
-    # Randomly select 5 questions
-    if len(unique_questions) >= 5:
-        selected = random.sample(unique_questions, 5)
-    else:
-        selected = unique_questions
+def start_question_stream(tech_stack, years_experience, job_role, ai_model, on_complete=None):
+    """Start generating questions in the background, publishing each as soon as it is decoded"""
+    from question_stopping import question_stopping_criteria
+
+    # Streaming needs direct access to the model, so it bypasses the batching worker's queue,
+    # but takes one of the worker's generate slots so concurrent starts can't pile onto the model
+    generator = getattr(ai_model, 'generator', ai_model)
+    generate_kwargs = {}
+    if getattr(generator, 'assistant_model', None) is not None:
+        generate_kwargs['assistant_model'] = generator.assistant_model
+    # The stream's parser and the stopping criterion must keep the same questions
+    accept = get_question_filter().accepts
+    return QuestionStream(
+        generator,
+        build_question_prompt(tech_stack, years_experience, job_role),
+        on_complete=on_complete,
+        prefix_cache=get_prefix_cache(),
+        generate_slots=getattr(ai_model, 'generate_slots', None),
+        accept=accept,
+        stopping_criteria_factory=lambda prompt_length: question_stopping_criteria(
+            generator.tokenizer, prompt_length, accept=accept
+        ),
+        max_new_tokens=MAX_NEW_TOKENS,
+        max_time=GENERATION_TIME_BUDGET,
+        temperature=0.8,
+        top_p=0.9,
+        top_k=50,
+        repetition_penalty=1.2,
+        do_sample=True,
+        pad_token_id=generator.tokenizer.eos_token_id,
+        **generate_kwargs
+    ).start()
+
+def get_cached_ai_questions(tech_stack, years_experience, job_role, ai_model):
+    """Serve questions from the cache, generating a new variant on a miss"""
+    if not ai_model:
+        increment("question_fallbacks_total", reason="no_model")
+        return get_questions_for_tech_stack(tech_stack, years_experience)
+
+    cache = get_question_cache()
+    key = make_cache_key(tech_stack, years_experience, job_role)
+    questions = cache.get(key)
+    if questions is None:
+        questions, generated = generate_ai_questions(tech_stack, years_experience, job_role, ai_model)
+        # Template fallbacks (including a model run that yielded no usable question) would
+        # otherwise be served as a model variant for the whole TTL
+        if generated:
+            cache.put(key, questions)
+    return questions
+
+def stream_cached_ai_questions(tech_stack, years_experience, job_role, ai_model):
+    """Like get_cached_ai_questions, but a cache miss streams a new variant in the background"""
+    cache = get_question_cache()
+    key = make_cache_key(tech_stack, years_experience, job_role)
+    questions = cache.get(key)
+    if questions is not None:
+        return questions, None
     
-    return selected
+    def on_complete(questions):
+        # A stream that produced no usable question is all templates once padded; don't cache it
+        if questions:
+            cache.put(key, pad_with_template_questions(questions, tech_stack, years_experience))
 
-def add_message(sender, message, message_type="normal"):
-    """Add a message to chat history"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    st.session_state.chat_history.append({
-        'sender': sender,
-        'message': message,
-        'type': message_type
-    })
+    stream = start_question_stream(tech_stack, years_experience, job_role, ai_model, on_complete=on_complete)
+    return [], stream
 
 def display_chat():
     """Display the chat interface"""
     st.markdown("### 💬 Interview Chat")
     st.markdown("---")
     
+    interview = st.session_state.interview
+    
+    # Only the recent window is rendered; older messages are paged in from the transcript on request
+    earlier = []
+    if interview.has_earlier_messages and interview.transcript is not None:
+        if st.button("Load earlier messages", type="secondary"):
+            st.session_state.history_pages += 1
+        if st.session_state.history_pages:
+            earlier = interview.earlier_messages(HISTORY_PAGE_SIZE * st.session_state.history_pages)
+    
     # Chat container
     chat_container = st.container()
     
-    with chat_container:
-        for msg in st.session_state.chat_history:
+    with chat_container, timed("display_chat"):
+        for msg in earlier + list(interview.chat_history):
             if msg['sender'] == 'Bot':
                 with st.chat_message("assistant"):
                     st.write(f"**Bot:** {msg['message']}")
@@ -248,64 +217,131 @@ def display_chat():
                     st.write(f"**You:** {msg['message']}")
                    
 
+def display_answer_scores(interview):
+    """Show the scores for the candidate's answers, as far as they are ready"""
+    scores = interview.answer_scores()
+    if not scores:
+        return
+    
+    st.markdown("### 📊 Answer Scores")
+    for i, (question, answer, score) in enumerate(scores):
+        st.write(f"**Q{i+1}:** {question}")
+        if score is None:
+            st.caption("Scoring...")
+            continue
+        coverage = "n/a" if score['coverage'] is None else f"{score['coverage']:.0%}"
+        keywords = ", ".join(score['keywords']) or "none"
+        st.caption(f"Score {score['score']:.0%} · relevance {score['relevance']:.0%} · skill coverage {coverage} (mentioned: {keywords})")
+    
+    if interview.scores_pending and st.button("Refresh scores", type="secondary"):
+        st.rerun()
+
+def display_admin_panel():
+    """Sidebar panel with stage timings, counters and worker queues"""
+    with st.expander("⚙️ Metrics"):
+        stats = snapshot()
+        if not stats['stages'] and not stats['counters']:
+            st.caption("Nothing recorded yet; set HIREBUDDY_METRICS=1 to collect stage timings.")
+        if stats['stages']:
+            st.table([
+                {'stage': stage, 'count': s['count'], 'mean ms': round(s['mean_ms'], 1), 'max ms': round(s['max_ms'], 1)}
+                for stage, s in sorted(stats['stages'].items())
+            ])
+        for series, value in sorted(stats['counters'].items()):
+            st.caption(f"{series}: {value}")
+        
+        resources = None if TEMPLATE_ONLY else get_ai_model_registry().peek()
+        if resources:
+            st.caption(f"Inference worker: {resources['worker'].metrics()}")
+        st.caption(f"Answer scoring: {get_answer_scorer().metrics()}")
+
+def get_ai_model():
+    """Get the model to generate with: the shared model server if configured, else the local model"""
+    if TEMPLATE_ONLY:
+        return None
+    
+    client = get_model_server_client()
+    if client is not None:
+        # While the server is down, interviews fall back to template questions
+        return client if client.available() else None
+    
+    # The model is owned by the process and normally already warm from the greeting form
+    registry = get_ai_model_registry()
+    if registry.status()['state'] == READY:
+        ai_model = get_inference_worker()
+    else:
+        with st.spinner("Loading AI model for personalized questions..."):
+            ai_model = get_inference_worker()
+    if ai_model is None and registry.error:
+        st.error(f"Error loading AI model: {registry.error}")
+    return ai_model
+
+def get_model_status():
+    """Short model health description for the sidebar"""
+    if TEMPLATE_ONLY:
+        return "template questions only"
+    client = get_model_server_client()
+    if client is not None:
+        return "model server" if client.available() else "model server unreachable"
+    return get_ai_model_registry().status()['state']
+
 def start_interview():
     """Start the interview process"""
-    st.session_state.interview_started = True
-    st.session_state.current_question = 0
+    interview = st.session_state.interview
+    data = interview.candidate_data
     
-    # Load AI model if not already loaded
-    if st.session_state.ai_model is None:
-        with st.spinner("Loading AI model for personalized questions..."):
-            st.session_state.ai_model = load_ai_model()
+    questions = get_pregenerated_questions(data)
+    if questions:
+        interview.start(questions)
+        return
+    
+    ai_model = get_ai_model()
     
     # Generate questions using AI model
     with st.spinner("Generating personalized interview questions..."):
-        st.session_state.interview_questions = generate_ai_questions(
-            st.session_state.candidate_data['tech_stack'],
-            st.session_state.candidate_data['years_experience'],
-            st.session_state.candidate_data['job_role'],
-            st.session_state.ai_model
-        )
-    
-    # Add welcome message
-    welcome_msg = f"Hello {st.session_state.candidate_data['name']}! I'm your AI interview assistant. I've generated personalized questions based on your {st.session_state.candidate_data['years_experience']} years of experience as a {st.session_state.candidate_data['job_role']} with expertise in {st.session_state.candidate_data['tech_stack']}. Let's begin!"
-    add_message('Bot', welcome_msg)
-    
-    # Add first question
-    if st.session_state.interview_questions:
-        add_message('Bot', st.session_state.interview_questions[0])
-        st.session_state.current_question = 1
-
-def next_question():
-    """Move to the next question"""
-    if st.session_state.current_question < len(st.session_state.interview_questions):
-        add_message('Bot', st.session_state.interview_questions[st.session_state.current_question])
-        st.session_state.current_question += 1
-    else:
-        # Interview completed
-        add_message('Bot', "Thank you for the interview! That was the last question. You did great! Do you have any questions for me?")
-        st.session_state.conversation_state = 'interview_completed'
+        # Streaming decodes in this process, so it isn't available through the model server
+        if STREAM_QUESTIONS and ai_model and get_model_server_client() is None:
+            questions, stream = stream_cached_ai_questions(
+                data['tech_stack'], data['years_experience'], data['job_role'], ai_model
+            )
+            # Only waits for the first question; the rest keep decoding in the background
+            interview.start(
+                questions,
+                question_stream=stream,
+                fallback_questions=get_questions_for_tech_stack(data['tech_stack'], data['years_experience'])
+            )
+        else:
+            interview.start(get_cached_ai_questions(
+                data['tech_stack'], data['years_experience'], data['job_role'], ai_model
+            ))
 
 def main():
     st.title("HireBuddy 🫂✨")
     st.markdown("Welcome! I'm your AI interview assistant. I'll conduct a personalized, real-time interview with you using advanced AI to generate questions tailored to your experience and role.")
     
+    interview = st.session_state.interview
+    
     # Sidebar for candidate info
     with st.sidebar:
         st.markdown("## 👤 Candidate Information")
-        if st.session_state.candidate_data:
-            st.write(f"**Name:** {st.session_state.candidate_data.get('name', 'N/A')}")
-            st.write(f"**Email:** {st.session_state.candidate_data.get('email', 'N/A')}")
-            st.write(f"**Phone:** {st.session_state.candidate_data.get('phone', 'N/A')}")
-            st.write(f"**Experience:** {st.session_state.candidate_data.get('years_experience', 'N/A')}")
-            st.write(f"**Job Role:** {st.session_state.candidate_data.get('job_role', 'N/A')}")
-            st.write(f"**Tech Stack:** {st.session_state.candidate_data.get('tech_stack', 'N/A')}")
+        if interview.candidate_data:
+            st.write(f"**Name:** {interview.candidate_data.get('name', 'N/A')}")
+            st.write(f"**Email:** {interview.candidate_data.get('email', 'N/A')}")
+            st.write(f"**Phone:** {interview.candidate_data.get('phone', 'N/A')}")
+            st.write(f"**Experience:** {interview.candidate_data.get('years_experience', 'N/A')}")
+            st.write(f"**Job Role:** {interview.candidate_data.get('job_role', 'N/A')}")
+            st.write(f"**Tech Stack:** {interview.candidate_data.get('tech_stack', 'N/A')}")
         
         st.markdown("## Interview Progress")
-        if st.session_state.interview_started and st.session_state.interview_questions:
-            progress = st.session_state.current_question / len(st.session_state.interview_questions)
+        if interview.interview_started and interview.interview_questions:
+            total_questions = interview.total_questions
+            progress = interview.current_question / total_questions
             st.progress(progress)
-            st.write(f"Question {st.session_state.current_question} of {len(st.session_state.interview_questions)}")
+            st.write(f"Question {interview.current_question} of {total_questions}")
+        
+        st.caption(f"AI model: {get_model_status()}")
+        if ADMIN_PANEL:
+            display_admin_panel()
         
         st.markdown("## Instructions")
         st.markdown("""
@@ -317,7 +353,11 @@ def main():
         """)
     
     # Main content area
-    if st.session_state.conversation_state == 'greeting':
+    if interview.conversation_state == GREETING:
+        # Start loading the model while the candidate fills in the form
+        if not TEMPLATE_ONLY and get_model_server_client() is None:
+            get_ai_model_registry().warm_up()
+        
         st.markdown("**Bot:** Hello! I'm your AI interview assistant. Let me get some basic information about you first.")
         
         # Candidate information form
@@ -354,35 +394,34 @@ def main():
             
             if submitted:
                 if name and email and phone and tech_stack and years_experience and job_role:
-                    st.session_state.candidate_data = {
+                    interview.submit_candidate({
                         'name': name,
                         'email': email,
                         'phone': phone,
                         'tech_stack': tech_stack,
                         'years_experience': years_experience,
                         'job_role': job_role
-                    }
-                    st.session_state.conversation_state = 'interview_ready'
+                    })
                     st.rerun()
                 else:
                     st.error("Please fill in all fields!")
     
-    elif st.session_state.conversation_state == 'interview_ready':
-        st.markdown(f"**Bot:** Perfect! I have your information. I'll be conducting a personalized interview for a **{st.session_state.candidate_data.get('job_role', 'N/A')}** position, tailored to your **{st.session_state.candidate_data.get('years_experience', 'N/A')}** experience level with **{st.session_state.candidate_data.get('tech_stack', 'N/A')}**. Are you ready to start?")
+    elif interview.conversation_state == INTERVIEW_READY:
+        st.markdown(f"**Bot:** Perfect! I have your information. I'll be conducting a personalized interview for a **{interview.candidate_data.get('job_role', 'N/A')}** position, tailored to your **{interview.candidate_data.get('years_experience', 'N/A')}** experience level with **{interview.candidate_data.get('tech_stack', 'N/A')}**. Are you ready to start?")
         
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Yes, Start Interview!", type="primary"):
-                start_interview()
-                st.session_state.conversation_state = 'interviewing'
+                with profiled("start_interview"), timed("start_interview"):
+                    start_interview()
                 st.rerun()
         
         with col2:
             if st.button("Let me review my info", type="secondary"):
-                st.session_state.conversation_state = 'greeting'
+                interview.review_info()
                 st.rerun()
     
-    elif st.session_state.conversation_state == 'interviewing':
+    elif interview.conversation_state == INTERVIEWING:
         # Display chat
         display_chat()
         
@@ -391,61 +430,35 @@ def main():
         user_input = st.chat_input("Type your answer here...")
         
         if user_input:
-            # Add user message
-            add_message('You', user_input)
-            
-            # Check for ending keywords
-            if detect_ending(user_input):
-                add_message('Bot', "I understand you'd like to end the interview. Thank you for your time!")
-                st.session_state.conversation_state = 'interview_completed'
-                st.rerun()
-            else:
-                # Move to next question
-                if st.session_state.current_question < len(st.session_state.interview_questions):
-                    # Add acknowledgment
-                    acknowledgments = [
-                        "Thank you for that answer!",
-                        "Interesting perspective!",
-                        "Good point!",
-                        "That's helpful!",
-                        "Thanks for explaining that!"
-                    ]
-                    add_message('Bot', random.choice(acknowledgments))
-                    
-                    # Add next question
-                    next_question()
-                else:
-                    add_message('Bot', "That was the last question! Thank you for the interview.")
-                    st.session_state.conversation_state = 'interview_completed'
-            
+            if not detect_ending(user_input) and not interview.question_ready(interview.current_question + 1):
+                # The next question is still being generated
+                with st.spinner("Preparing the next question..."):
+                    interview.sync_questions(interview.current_question + 1)
+            interview.answer(user_input)
             st.rerun()
     
-    elif st.session_state.conversation_state == 'interview_completed':
+    elif interview.conversation_state == INTERVIEW_COMPLETED:
         display_chat()
         
         st.markdown("---")
         st.markdown("**Bot:** The interview is complete! Thank you for your time and answers.")
         
+        display_answer_scores(interview)
+        
         col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("Start New Interview", type="primary"):
                 # Reset everything
-                st.session_state.conversation_state = 'greeting'
-                st.session_state.candidate_data = {}
-                st.session_state.chat_history = []
-                st.session_state.current_question = 0
-                st.session_state.interview_questions = []
-                st.session_state.interview_started = False
-                st.session_state.ai_model = None
+                interview.reset()
+                st.session_state.history_pages = 0
                 st.rerun()
         
         with col2:
             if st.button("Review Answers", type="secondary"):
                 st.markdown("### 📝 Interview Summary")
                 st.write("Here's a summary of your interview:")
-                for i, msg in enumerate(st.session_state.chat_history):
-                    if msg['sender'] == 'Bot' and '?' in msg['message']:
-                        st.write(f"**Q{i+1}:** {msg['message']}")
+                for i, message in interview.asked_questions():
+                    st.write(f"**Q{i+1}:** {message}")
         
         with col3:
             if st.button("End Session", type="secondary"):
@@ -0,0 +1,186 @@
+import contextlib
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import metrics
+
+
+class _Request:
+    __slots__ = ('prompt', 'kwargs', 'future', 'enqueued')
+
+    def __init__(self, prompt, kwargs):
+        self.prompt = prompt
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class InferenceWorker:
+    """Process-wide worker that micro-batches generation requests from all sessions
+
+    Calling the worker behaves like calling the wrapped text-generation
+    pipeline, so it can be passed anywhere the pipeline is used. When
+    stopping_criteria_factory is given, each batch gets a fresh
+    StoppingCriteriaList from it, called with the batch's padded prompt
+    length in tokens. generate_slots is a semaphore held around every
+    generate call, for sharing the model with callers that bypass the queue.
+    """
+
+    def __init__(self, generator, max_batch_size=4, max_wait_ms=20, stopping_criteria_factory=None,
+                 generate_slots=None):
+        self.generator = generator
+        self.tokenizer = generator.tokenizer
+        self.stopping_criteria_factory = stopping_criteria_factory
+        self.generate_slots = generate_slots
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'requests': 0,
+            'batches': 0,
+            'batched_requests': 0,
+            'errors': 0,
+            'max_queue_depth': 0,
+        }
+        self._queue_waits = deque(maxlen=1000)
+        self._latencies = deque(maxlen=1000)
+        self._thread = threading.Thread(target=self._run, name="hirebuddy-inference", daemon=True)
+        self._thread.start()
+
+    def submit(self, prompt, **kwargs):
+        """Queue a prompt for generation and return a Future for its result"""
+        request = _Request(prompt, kwargs)
+        with self._lock:
+            # Nothing would ever serve a request queued behind the close sentinel
+            if self._closed:
+                raise RuntimeError("inference worker is closed")
+            self._queue.put(request)
+            self._stats['requests'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+        return request.future
+
+    def __call__(self, prompt, timeout=None, **kwargs):
+        """Blocking, pipeline-compatible generation"""
+        future = self.submit(prompt, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Skipped by the worker if it hasn't started on it yet
+            future.cancel()
+            raise
+
+    def close(self):
+        """Stop the worker thread once the requests already queued are served"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+    def metrics(self):
+        """Snapshot of queue depth, batching and latency metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            waits = sorted(self._queue_waits)
+            latencies = sorted(self._latencies)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_batch_size'] = stats['batched_requests'] / stats['batches'] if stats['batches'] else 0.0
+        stats['p50_queue_wait_ms'] = _percentile(waits, 50) * 1000
+        stats['p95_queue_wait_ms'] = _percentile(waits, 95) * 1000
+        stats['p50_latency_ms'] = _percentile(latencies, 50) * 1000
+        stats['p95_latency_ms'] = _percentile(latencies, 95) * 1000
+        return stats
+
+    def _collect_batch(self):
+        """Block for one request, then coalesce more until the batch is full or the window closes"""
+        request = self._queue.get()
+        if request is None:
+            return None
+        batch = [request]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Serve this batch first, then shut down
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                return
+            # Callers that gave up waiting cancelled their requests
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+
+            # Requests with different generation settings can't share a generate call
+            groups = {}
+            for request in batch:
+                key = tuple(sorted((k, repr(v)) for k, v in request.kwargs.items()))
+                groups.setdefault(key, []).append(request)
+
+            for requests in groups.values():
+                self._generate(requests)
+
+    def _generate(self, requests):
+        started = time.perf_counter()
+        prompts = [r.prompt for r in requests]
+        kwargs = dict(requests[0].kwargs)
+        try:
+            if self.stopping_criteria_factory is not None:
+                # The pipeline left-pads every prompt to the longest one in the batch
+                prompt_length = max(len(self.tokenizer(prompt).input_ids) for prompt in prompts)
+                kwargs['stopping_criteria'] = self.stopping_criteria_factory(prompt_length)
+            # The pipeline tokenizes, decodes and detokenizes in one call
+            with self.generate_slots or contextlib.nullcontext(), metrics.timed("generate"):
+                outputs = self.generator(prompts, batch_size=len(prompts), **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += len(requests)
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['batched_requests'] += len(requests)
+            for request in requests:
+                self._queue_waits.append(started - request.enqueued)
+                self._latencies.append(finished - request.enqueued)
+
+        if metrics.ENABLED:
+            full_text = kwargs.get('return_full_text', True)
+            metrics.increment("generated_tokens_total", self._count_new_tokens(prompts, outputs, full_text))
+
+        for request, output in zip(requests, outputs):
+            request.future.set_result(output)
+
+    def _count_new_tokens(self, prompts, outputs, full_text=True):
+        """Tokens generated past the prompts; only worth the extra tokenization when metrics are on"""
+        total = 0
+        for prompt, output in zip(prompts, outputs):
+            prompt_tokens = len(self.tokenizer(prompt).input_ids) if full_text else 0
+            for sequence in output if isinstance(output, list) else [output]:
+                total += len(self.tokenizer(sequence['generated_text']).input_ids) - prompt_tokens
+        return max(total, 0)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
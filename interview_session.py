@@ -0,0 +1,251 @@
+import random
+import uuid
+from collections import deque
+
+from answer_scoring import score_answer
+from model_service import GENERATION_TIME_BUDGET
+from question_parser import NUM_QUESTIONS
+from skill_matcher import ENDING_COMMANDS, ENDING_MATCHER, match_skills, tokenize
+from transcript_store import is_question
+
+GREETING = 'greeting'
+INTERVIEW_READY = 'interview_ready'
+INTERVIEWING = 'interviewing'
+INTERVIEW_COMPLETED = 'interview_completed'
+
+# Longer messages are answers that happen to say "thanks" or "bye", not goodbyes
+MAX_ENDING_WORDS = 5
+
+# Messages a session keeps in memory when its transcript is persisted
+HISTORY_WINDOW = 40
+
+# Longest a turn waits on the question stream before falling back to template questions;
+# decoding itself is capped at the same budget
+STREAM_WAIT_TIMEOUT = GENERATION_TIME_BUDGET
+
+ACKNOWLEDGMENTS = [
+    "Thank you for that answer!",
+    "Interesting perspective!",
+    "Good point!",
+    "That's helpful!",
+    "Thanks for explaining that!"
+]
+
+
+def detect_ending(text):
+    """True for a short goodbye ("Thanks, bye!") or a bare command ("exit"), not for an answer"""
+    tokens = tokenize(text)
+    if not tokens or len(tokens) > MAX_ENDING_WORDS:
+        return False
+    return ' '.join(tokens) in ENDING_COMMANDS or ENDING_MATCHER.matches(text)
+
+
+class InterviewSession:
+    """Interview state machine (greeting -> interview_ready -> interviewing -> interview_completed)
+
+    Pure Python so the Streamlit UI, the load test and batch tools can all
+    drive it. Questions still being generated come from an optional
+    QuestionStream; fallback_questions pad the set once that stream ends.
+
+    With a TranscriptStore every message is also appended to the store and
+    chat_history only holds the most recent window of messages; older ones
+    are paged back in with earlier_messages().
+
+    With an AnswerScorer each answer is scored in the background as it
+    comes in; answer_scores() collects whatever has finished.
+    """
+
+    __slots__ = (
+        'conversation_state', 'candidate_data', 'chat_history', 'current_question',
+        'interview_questions', 'interview_started', 'question_stream', 'fallback_questions',
+        'transcript', 'window', 'session_id', 'message_count', 'scorer', 'answers'
+    )
+
+    def __init__(self, transcript=None, window=HISTORY_WINDOW, scorer=None):
+        self.transcript = transcript
+        self.window = window
+        self.scorer = scorer
+        self.reset()
+
+    def reset(self):
+        """Start over with a blank candidate"""
+        self.conversation_state = GREETING
+        self.candidate_data = {}
+        self.session_id = uuid.uuid4().hex
+        self.message_count = 0
+        # Without a store the window is all there is, so it can't drop anything
+        self.chat_history = deque(maxlen=self.window if self.transcript is not None else None)
+        self.current_question = 0
+        self.interview_questions = []
+        self.interview_started = False
+        self.question_stream = None
+        self.fallback_questions = ()
+        self.answers = []
+
+    def add_message(self, sender, message, message_type="normal"):
+        """Add a message to chat history"""
+        self.chat_history.append({
+            'seq': self.message_count,
+            'sender': sender,
+            'message': message,
+            'type': message_type
+        })
+        if self.transcript is not None:
+            self.transcript.append(self.session_id, self.message_count, sender, message, message_type)
+        self.message_count += 1
+
+    def submit_candidate(self, candidate_data):
+        """Store the candidate's details and wait for them to start"""
+        self.candidate_data = dict(candidate_data)
+        self.conversation_state = INTERVIEW_READY
+
+    def review_info(self):
+        self.conversation_state = GREETING
+
+    def start(self, questions, question_stream=None, fallback_questions=()):
+        """Start the interview with the questions available so far"""
+        self.interview_started = True
+        self.current_question = 0
+        self.interview_questions = list(questions)
+        self.question_stream = question_stream
+        self.fallback_questions = tuple(fallback_questions)
+        self.sync_questions(1)
+
+        # Add welcome message
+        data = self.candidate_data
+        welcome_msg = f"Hello {data['name']}! I'm your AI interview assistant. I've generated personalized questions based on your {data['years_experience']} years of experience as a {data['job_role']} with expertise in {data['tech_stack']}. Let's begin!"
+        self.add_message('Bot', welcome_msg)
+
+        # Add first question
+        if self.interview_questions:
+            self.add_message('Bot', self.interview_questions[0])
+            self.current_question = 1
+        self.conversation_state = INTERVIEWING
+
+    def question_ready(self, required):
+        """True if answering now won't wait on generation for question number required"""
+        stream = self.question_stream
+        return stream is None or stream.done or len(stream.questions) >= required
+
+    def sync_questions(self, required, timeout=STREAM_WAIT_TIMEOUT):
+        """Pull questions decoded so far from the background stream, waiting for question number required"""
+        stream = self.question_stream
+        if stream is None:
+            return
+
+        if len(stream.questions) < required and not stream.done:
+            stream.wait_for(required, timeout=timeout)
+
+        if stream.done or len(stream.questions) < required:
+            # Generation finished, failed or stalled; fill any gaps with the fallback questions
+            questions = list(stream.questions)
+            for question in self.fallback_questions:
+                if len(questions) >= NUM_QUESTIONS:
+                    break
+                if question not in questions:
+                    questions.append(question)
+            self.interview_questions = questions[:NUM_QUESTIONS]
+            self.question_stream = None
+            self.fallback_questions = ()
+        else:
+            self.interview_questions = stream.questions
+
+    @property
+    def total_questions(self):
+        """Number of questions in this interview, including ones still being generated"""
+        if self.question_stream is not None:
+            return NUM_QUESTIONS
+        return len(self.interview_questions)
+
+    def next_question(self):
+        """Move to the next question"""
+        self.sync_questions(self.current_question + 1)
+        if self.current_question < len(self.interview_questions):
+            self.add_message('Bot', self.interview_questions[self.current_question])
+            self.current_question += 1
+        else:
+            # Interview completed
+            self.add_message('Bot', "Thank you for the interview! That was the last question. You did great! Do you have any questions for me?")
+            self.conversation_state = INTERVIEW_COMPLETED
+
+    def answer(self, user_input):
+        """Record the candidate's answer and move the interview along"""
+        self.add_message('You', user_input)
+
+        # Check for ending keywords
+        if detect_ending(user_input):
+            self.add_message('Bot', "I understand you'd like to end the interview. Thank you for your time!")
+            self.conversation_state = INTERVIEW_COMPLETED
+            return
+
+        self.record_answer(user_input)
+
+        # Move to next question
+        self.sync_questions(self.current_question + 1)
+        if self.current_question < len(self.interview_questions):
+            # Add acknowledgment
+            self.add_message('Bot', random.choice(ACKNOWLEDGMENTS))
+
+            # Add next question
+            self.next_question()
+        else:
+            self.add_message('Bot', "That was the last question! Thank you for the interview.")
+            self.conversation_state = INTERVIEW_COMPLETED
+
+    def record_answer(self, answer):
+        """Keep the answer to the current question and hand it to the scorer without waiting"""
+        if not 0 < self.current_question <= len(self.interview_questions):
+            return
+        question = self.interview_questions[self.current_question - 1]
+        skills = match_skills(self.candidate_data.get('tech_stack', ''))
+        # None when there is no scorer or it is saturated; answer_scores() scores those itself
+        future = self.scorer.submit(question, answer, skills) if self.scorer is not None else None
+        self.answers.append({
+            'question': question,
+            'answer': answer,
+            'skills': skills,
+            'future': future,
+            'score': None,
+        })
+
+    @property
+    def scores_pending(self):
+        """True while the scorer is still working on some of this session's answers"""
+        return any(
+            record['score'] is None and record['future'] is not None and not record['future'].done()
+            for record in self.answers
+        )
+
+    def answer_scores(self):
+        """(question, answer, score) per answered question; score is None while it is still being computed"""
+        results = []
+        for record in self.answers:
+            if record['score'] is None:
+                future = record['future']
+                if future is not None and future.done() and future.exception() is None:
+                    record['score'] = future.result()
+                elif future is None or future.done():
+                    # Never queued, or the scorer failed; the heuristic scores are cheap to do here
+                    record['score'] = score_answer(record['question'], record['answer'], record['skills'])
+            results.append((record['question'], record['answer'], record['score']))
+        return results
+
+    @property
+    def has_earlier_messages(self):
+        """True if older messages have dropped out of the in-memory window"""
+        return bool(self.chat_history) and self.chat_history[0]['seq'] > 0
+
+    def earlier_messages(self, limit):
+        """Up to limit messages from before the in-memory window, oldest first"""
+        if self.transcript is None or not self.has_earlier_messages:
+            return []
+        return self.transcript.page(self.session_id, before_seq=self.chat_history[0]['seq'], limit=limit)
+
+    def asked_questions(self):
+        """(position in chat history, message) for every question the bot asked"""
+        if self.transcript is not None:
+            return self.transcript.questions(self.session_id)
+        return [
+            (msg['seq'], msg['message']) for msg in self.chat_history
+            if is_question(msg['sender'], msg['message'])
+        ]
@@ -0,0 +1,213 @@
+"""Per-stage latency timers and counters, exported in Prometheus text format
+
+Disabled unless HIREBUDDY_METRICS=1; timed() then hands back a shared no-op
+context manager, so instrumented code pays one function call per stage.
+
+    with timed("decode"):
+        ...
+    increment("question_fallbacks_total", reason="error")
+
+HIREBUDDY_METRICS_FILE makes start_exporter() rewrite a Prometheus textfile
+every few seconds; the model server also serves the same text at /metrics.
+HIREBUDDY_PROFILE_DIR makes profiled() write a cProfile dump per call.
+"""
+import bisect
+import contextlib
+import cProfile
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("HIREBUDDY_METRICS", "0") == "1"
+METRICS_FILE = os.environ.get("HIREBUDDY_METRICS_FILE", "")
+PROFILE_DIR = os.environ.get("HIREBUDDY_PROFILE_DIR", "")
+
+# Histogram bucket upper bounds in seconds, from parse loops (ms) up to model loads (minutes)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PREFIX = "hirebuddy_"
+
+_NULL = contextlib.nullcontext()
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+
+
+class _Stage:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+
+class _Timer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None:
+            increment("errors_total", stage=self.stage)
+        return False
+
+
+def enable(enabled=True):
+    """Turn collection on or off at runtime (benchmarks, tests)"""
+    global ENABLED
+    ENABLED = enabled
+
+
+def timed(stage):
+    """Context manager that records how long the block took under stage"""
+    if not ENABLED:
+        return _NULL
+    return _Timer(stage)
+
+
+def observe(stage, seconds):
+    if not ENABLED:
+        return
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = _Stage()
+        entry.count += 1
+        entry.total += seconds
+        entry.max = max(entry.max, seconds)
+        entry.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+def increment(name, amount=1, **labels):
+    """Add amount to the counter name{labels}"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def snapshot():
+    """{'stages': {stage: {count, total_s, mean_ms, max_ms}}, 'counters': {name{labels}: value}}"""
+    with _lock:
+        stages = {
+            stage: {
+                'count': entry.count,
+                'total_s': entry.total,
+                'mean_ms': entry.total / entry.count * 1000 if entry.count else 0.0,
+                'max_ms': entry.max * 1000,
+            }
+            for stage, entry in _stages.items()
+        }
+        counters = {_series(name, labels): value for (name, labels), value in _counters.items()}
+    return {'stages': stages, 'counters': counters}
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format"""
+    with _lock:
+        stages = [(stage, entry.count, entry.total, list(entry.buckets)) for stage, entry in sorted(_stages.items())]
+        counters = sorted(_counters.items())
+
+    lines = [
+        f"# HELP {PREFIX}stage_seconds Time spent per pipeline stage",
+        f"# TYPE {PREFIX}stage_seconds histogram",
+    ]
+    for stage, count, total, buckets in stages:
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS + (float("inf"),), buckets):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{PREFIX}stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+        lines.append(f'{PREFIX}stage_seconds_sum{{stage="{stage}"}} {total}')
+        lines.append(f'{PREFIX}stage_seconds_count{{stage="{stage}"}} {count}')
+
+    typed = set()
+    for (name, labels), value in counters:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+        lines.append(f"{PREFIX}{_series(name, labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Atomically replace path with the current metrics (node_exporter textfile collector format)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+_exporter = None
+
+
+def start_exporter(path=METRICS_FILE, interval=15.0):
+    """Rewrite the metrics file every interval seconds on a daemon thread (once per process)"""
+    global _exporter
+    if not ENABLED or not path:
+        return
+    with _lock:
+        if _exporter is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_prometheus(path)
+                except OSError:
+                    # A missing directory or full disk shouldn't take the app down
+                    pass
+
+        _exporter = threading.Thread(target=run, name="hirebuddy-metrics-export", daemon=True)
+        _exporter.start()
+
+
+_profile_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _profile(name):
+    # Only one cProfile can be active per process; overlapping calls just run unprofiled
+    if not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f"{name}-{time.time_ns()}.prof"))
+    finally:
+        _profile_lock.release()
+
+
+def profiled(name):
+    """cProfile the block into PROFILE_DIR when profiling is switched on"""
+    if not PROFILE_DIR:
+        return _NULL
+    return _profile(name)
+
+
+def _series(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
@@ -0,0 +1,104 @@
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+BACKENDS = ('eager', 'int8', 'onnx', 'compile')
+
+# Backends whose models accept reused past_key_values from PrefixCache
+PREFIX_CACHE_BACKENDS = ('eager', 'int8', 'compile')
+
+# Backends whose models can verify a draft model's tokens (assisted generation)
+ASSISTED_BACKENDS = ('eager', 'int8', 'compile')
+
+
+def configure_threads(num_threads):
+    """Pin torch's intra-op and inter-op thread pools (0 keeps torch's defaults)"""
+    if not num_threads:
+        return
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(max(1, num_threads // 2))
+    except RuntimeError:
+        # Inter-op threads can only be set before any parallel work has started
+        pass
+
+
+def load_model(backend, model_name="gpt2", num_threads=0):
+    """Load (model, tokenizer) for a CPU inference backend
+
+    eager   - full precision PyTorch model (default)
+    int8    - dynamic int8 quantization of the linear layers
+    onnx    - exported ONNX Runtime graph (needs optimum[onnxruntime])
+    compile - torch.compile'd forward pass
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+    configure_threads(num_threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    if backend == 'onnx':
+        return _load_onnx(model_name, num_threads), tokenizer
+
+    model = AutoModelForCausalLM.from_pretrained(model_name)
+    model.eval()
+
+    if backend == 'int8':
+        model = quantize_int8(model)
+    elif backend == 'compile':
+        model.forward = torch.compile(model.forward, dynamic=True)
+
+    return model, tokenizer
+
+
+def load_draft_model(model_name="distilgpt2", num_assistant_tokens=5):
+    """Load a small model that proposes tokens for the main model to verify
+
+    It must share the main model's tokenizer. generate() starts each call
+    with num_assistant_tokens draft tokens and adapts the count as drafts
+    are accepted or rejected.
+    """
+    model = AutoModelForCausalLM.from_pretrained(model_name)
+    model.eval()
+    model.generation_config.num_assistant_tokens = num_assistant_tokens
+    return model
+
+
+def quantize_int8(model):
+    """Dynamically quantize the model's linear layers to int8"""
+    # GPT-2 uses transformers' Conv1D for its projections, which quantize_dynamic skips
+    _conv1d_to_linear(model)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _conv1d_to_linear(module):
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def _load_onnx(model_name, num_threads):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForCausalLM
+    except ImportError as e:
+        raise ImportError("The onnx backend needs optimum[onnxruntime]: pip install optimum[onnxruntime]") from e
+
+    session_options = onnxruntime.SessionOptions()
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+        session_options.inter_op_num_threads = 1
+    return ORTModelForCausalLM.from_pretrained(
+        model_name,
+        export=True,
+        use_cache=True,
+        provider="CPUExecutionProvider",
+        session_options=session_options
+    )
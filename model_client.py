@@ -0,0 +1,112 @@
+import http.client
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Per-request timeout in seconds, shared by the app's client and the server's own wait
+DEFAULT_TIMEOUT = float(os.environ.get("HIREBUDDY_MODEL_SERVER_TIMEOUT", "30"))
+
+# What a pooled connection raises when the server closed it while it sat idle
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class ModelServerError(Exception):
+    """The model server could not be reached or failed the request"""
+
+
+class ModelServerClient:
+    """Pipeline-compatible client for model_server.py
+
+    Calling the client behaves like calling the text-generation pipeline.
+    Keep-alive connections are pooled, and after a connection failure the
+    server is treated as down for retry_after seconds so callers can fall
+    back immediately instead of waiting on timeouts. A request that times
+    out after reaching the server fails on its own, without marking the
+    server down; a per-call timeout can only shorten the client's timeout.
+    """
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT, pool_size=4, retry_after=15):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._down_until = 0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """False while the server is considered down after a failure"""
+        return time.time() >= self._down_until
+
+    def __call__(self, prompt, timeout=None, **kwargs):
+        payload = {'prompt': prompt, 'kwargs': kwargs}
+        return self._request("POST", "/generate", payload, timeout=timeout)['outputs']
+
+    def health(self):
+        """Fetch the server's model status and worker metrics"""
+        return self._request("GET", "/health")
+
+    def _request(self, method, path, payload=None, timeout=None):
+        if not self.available():
+            raise ModelServerError("model server is marked down")
+
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {'Content-Type': "application/json"} if body else {}
+        conn = self._acquire()
+        # A connected socket means a pooled keep-alive connection
+        reused = conn.sock is not None
+        for attempt in range(2):
+            try:
+                response, data = self._send(conn, method, path, body, headers, timeout)
+                break
+            except (OSError, http.client.HTTPException) as e:
+                # Still connected means the server took the request and is just slow
+                timed_out = isinstance(e, socket.timeout) and conn.sock is not None
+                conn.close()
+                if timed_out:
+                    raise ModelServerError(f"model server timed out after {conn.timeout:g}s") from e
+                # The server may have closed an idle pooled connection; that says nothing
+                # about its health, so retry once on a fresh connection before marking it down
+                if attempt == 0 and reused and isinstance(e, STALE_CONNECTION_ERRORS):
+                    conn = self._connect()
+                    continue
+                with self._lock:
+                    self._down_until = time.time() + self.retry_after
+                raise ModelServerError(f"model server unreachable: {e}") from e
+
+        self._release(conn)
+        try:
+            result = json.loads(data)
+        except ValueError as e:
+            raise ModelServerError(f"invalid response from model server: {e}") from e
+        if response.status != 200:
+            raise ModelServerError(result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def _send(self, conn, method, path, body, headers, timeout):
+        conn.timeout = min(timeout, self.timeout) if timeout else self.timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(conn.timeout)
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
@@ -0,0 +1,141 @@
+import gc
+import threading
+import time
+
+UNLOADED = 'unloaded'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Owns one lazily-loaded model per process, independent of any Streamlit session
+
+    loader() builds the model resources; on_unload(resources) releases
+    anything that holds on to them (e.g. worker threads). With an
+    idle_timeout the resources are unloaded after that many seconds
+    without a get().
+    """
+
+    def __init__(self, loader, on_unload=None, idle_timeout=0, retry_after=60):
+        self.loader = loader
+        self.on_unload = on_unload
+        self.idle_timeout = idle_timeout
+        self.retry_after = retry_after
+        self.state = UNLOADED
+        self.error = None
+        self.load_seconds = None
+        self.loaded_at = None
+        self.last_used = None
+        self._resources = None
+        self._failed_at = None
+        self._condition = threading.Condition()
+        self._reaper = None
+
+    def warm_up(self):
+        """Start loading in the background if nothing is loaded or loading yet"""
+        with self._condition:
+            if not self._should_load():
+                return
+            self.state = LOADING
+        threading.Thread(target=self._load, name="hirebuddy-model-warmup", daemon=True).start()
+
+    def get(self, timeout=None):
+        """Return the loaded resources, loading or waiting for a warm-up if needed"""
+        with self._condition:
+            load_here = self._should_load()
+            if load_here:
+                self.state = LOADING
+        if load_here:
+            self._load()
+
+        with self._condition:
+            self._condition.wait_for(lambda: self.state != LOADING, timeout=timeout)
+            if self.state != READY:
+                return None
+            self.last_used = time.time()
+            return self._resources
+
+    def peek(self):
+        """Return the resources only if they are already loaded"""
+        with self._condition:
+            return self._resources if self.state == READY else None
+
+    def status(self):
+        """Readiness and health snapshot"""
+        with self._condition:
+            return {
+                'state': self.state,
+                'error': str(self.error) if self.error else None,
+                'load_seconds': self.load_seconds,
+                'loaded_at': self.loaded_at,
+                'last_used': self.last_used,
+            }
+
+    def unload(self, if_idle=False):
+        """Drop the loaded resources so their memory can be reclaimed
+
+        With if_idle, only unload if no get() handed them out within
+        idle_timeout; checked under the lock, so a get() racing the reaper
+        never returns resources that are about to be released.
+        """
+        with self._condition:
+            if self.state != READY:
+                return
+            if if_idle and time.time() - self.last_used < self.idle_timeout:
+                return
+            resources, self._resources = self._resources, None
+            self.state = UNLOADED
+            self.loaded_at = None
+        if self.on_unload:
+            self.on_unload(resources)
+        del resources
+        gc.collect()
+
+    def _should_load(self):
+        if self.state == UNLOADED:
+            return True
+        # Give a failed load another chance once the retry window has passed
+        return self.state == FAILED and time.time() - self._failed_at >= self.retry_after
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            resources = self.loader()
+        except Exception as e:
+            with self._condition:
+                self.state = FAILED
+                self.error = e
+                self._failed_at = time.time()
+                self._condition.notify_all()
+            return
+
+        with self._condition:
+            self._resources = resources
+            self.state = READY
+            self.error = None
+            self.load_seconds = time.perf_counter() - start
+            self.loaded_at = self.last_used = time.time()
+            self._condition.notify_all()
+            if self.idle_timeout and self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_idle, name="hirebuddy-model-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap_idle(self):
+        while True:
+            time.sleep(max(1, min(self.idle_timeout / 2, 30)))
+            with self._condition:
+                idle = self.state == READY and time.time() - self.last_used >= self.idle_timeout
+            if idle:
+                self.unload(if_idle=True)
+
+
+def get_model_registry(key, loader, **kwargs):
+    """Return the process-wide registry for key (e.g. a model backend), creating it on first use"""
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelRegistry(loader, **kwargs)
+        return _registries[key]
@@ -0,0 +1,110 @@
+"""Standalone inference server so several Streamlit workers can share one model
+
+Usage:
+    python model_server.py [--host 127.0.0.1] [--port 8765]
+
+Then start the app with HIREBUDDY_MODEL_SERVER=http://127.0.0.1:8765.
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import render_prometheus
+from model_client import DEFAULT_TIMEOUT
+from model_service import get_ai_model_registry, get_inference_worker
+
+# Generation settings a client may override per request
+ALLOWED_KWARGS = {
+    'max_new_tokens', 'max_time', 'num_return_sequences', 'temperature',
+    'top_p', 'top_k', 'do_sample', 'repetition_penalty', 'return_full_text'
+}
+
+# Longest a request may wait for its generation; the same HIREBUDDY_MODEL_SERVER_TIMEOUT
+# the clients use, so nothing decodes for a client that has already given up
+REQUEST_TIMEOUT = DEFAULT_TIMEOUT
+
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets clients reuse pooled connections
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/health":
+            self._send_json(404, {'error': "not found"})
+            return
+
+        registry = get_ai_model_registry()
+        status = registry.status()
+        resources = registry.peek()
+        if resources:
+            status['worker'] = resources['worker'].metrics()
+        self._send_json(200 if status['state'] == 'ready' else 503, status)
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._send_json(404, {'error': "not found"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            prompt = payload['prompt']
+            kwargs = {k: v for k, v in payload.get('kwargs', {}).items() if k in ALLOWED_KWARGS}
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f"bad request: {e}"})
+            return
+
+        worker = get_inference_worker()
+        if worker is None:
+            self._send_json(503, {'error': "model not available"})
+            return
+
+        try:
+            outputs = worker(prompt, timeout=REQUEST_TIMEOUT, **kwargs)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'outputs': outputs})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Request logging on every generation is noise; errors are returned to the client
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HireBuddy model server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # Load the model right away so the first interview doesn't pay for it
+    get_ai_model_registry().warm_up()
+
+    server = ThreadingHTTPServer((args.host, args.port), ModelRequestHandler)
+    print(f"HireBuddy model server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
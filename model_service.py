@@ -0,0 +1,146 @@
+import os
+import threading
+
+from inference_worker import InferenceWorker
+from metrics import timed
+from model_registry import get_model_registry
+from question_parser import QUESTION_PROMPT_PREFIX
+
+# torch and transformers are imported inside the loading path only, so importing
+# this module (and rendering the greeting form) never pays for them
+
+# Per-request generation budget; decoding also stops early once five questions are parsed
+MAX_NEW_TOKENS = int(os.environ.get("HIREBUDDY_MAX_NEW_TOKENS", "256"))
+GENERATION_TIME_BUDGET = float(os.environ.get("HIREBUDDY_GENERATION_TIME_BUDGET", "20"))
+# Longest a blocking caller waits for its result, queueing behind other batches included
+GENERATION_TIMEOUT = float(os.environ.get("HIREBUDDY_GENERATION_TIMEOUT", str(GENERATION_TIME_BUDGET * 2)))
+
+# CPU inference backend (eager, int8, onnx or compile) and torch thread count (0 = torch default)
+MODEL_BACKEND = os.environ.get("HIREBUDDY_MODEL_BACKEND", "eager")
+MODEL_THREADS = int(os.environ.get("HIREBUDDY_MODEL_THREADS", "0"))
+
+# Optional draft model for assisted (speculative) decoding, e.g. distilgpt2; it proposes
+# HIREBUDDY_DRAFT_TOKENS tokens at a time and gpt2 verifies them in one forward pass
+DRAFT_MODEL = os.environ.get("HIREBUDDY_DRAFT_MODEL", "")
+DRAFT_TOKENS = int(os.environ.get("HIREBUDDY_DRAFT_TOKENS", "5"))
+
+# Idle seconds before the model is unloaded to reclaim memory (0 = keep it loaded)
+MODEL_IDLE_UNLOAD = float(os.environ.get("HIREBUDDY_MODEL_IDLE_UNLOAD", "0"))
+
+# Serve template questions only; torch and transformers are never imported
+TEMPLATE_ONLY = os.environ.get("HIREBUDDY_TEMPLATE_ONLY", "0") == "1"
+
+
+# Load AI model for question generation
+def load_ai_model(backend=None, num_threads=None, draft_model=None):
+    """Load a lightweight AI model for question generation (backend, threads and draft model default to the environment)"""
+    from transformers import pipeline
+    from model_backends import ASSISTED_BACKENDS, load_draft_model, load_model
+
+    backend = backend or MODEL_BACKEND
+    draft_model = DRAFT_MODEL if draft_model is None else draft_model
+    if draft_model and backend not in ASSISTED_BACKENDS:
+        raise ValueError(f"A draft model needs one of the {', '.join(ASSISTED_BACKENDS)} backends, not {backend!r}")
+
+    with timed("load_ai_model"):
+        # Using GPT-2 small for better performance on M2 MacBook
+        model_name = "gpt2"
+        model, tokenizer = load_model(
+            backend,
+            model_name,
+            num_threads=MODEL_THREADS if num_threads is None else num_threads
+        )
+
+        # Set pad token
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        # Decoder-only models must be left-padded for batched generation
+        tokenizer.padding_side = "left"
+
+        generate_kwargs = {}
+        assistant_model = None
+        if draft_model:
+            assistant_model = load_draft_model(draft_model, num_assistant_tokens=DRAFT_TOKENS)
+            generate_kwargs['assistant_model'] = assistant_model
+
+        # Create text generation pipeline
+        generator = pipeline(
+            "text-generation",
+            model=model,
+            tokenizer=tokenizer,
+            max_new_tokens=MAX_NEW_TOKENS,
+            do_sample=True,
+            temperature=0.8,
+            top_p=0.9,
+            top_k=50,
+            repetition_penalty=1.2,
+            pad_token_id=tokenizer.eos_token_id,
+            **generate_kwargs
+        )
+        # Kept on the pipeline so callers that use model.generate() directly can pass it too
+        generator.assistant_model = assistant_model
+        return generator
+
+
+def build_model_resources():
+    """Load the model plus everything built on top of it"""
+    from model_backends import PREFIX_CACHE_BACKENDS
+    from prefix_cache import PrefixCache
+    from question_source import get_question_filter
+    from question_stopping import question_stopping_criteria
+
+    generator = load_ai_model()
+    assisted = generator.assistant_model is not None
+
+    # Shared inference worker so concurrent sessions are batched onto one model;
+    # assisted generation verifies one sequence at a time, so it can't batch
+    batch_size = 1 if assisted else int(os.environ.get("HIREBUDDY_BATCH_SIZE", "4"))
+    worker = InferenceWorker(
+        generator,
+        max_batch_size=batch_size,
+        max_wait_ms=float(os.environ.get("HIREBUDDY_BATCH_WAIT_MS", "20")),
+        # Streamed generations run their own generate() calls; they share these slots with
+        # the worker's batches, so no more than batch_size calls ever compete for the model
+        generate_slots=threading.BoundedSemaphore(batch_size),
+        # Stop on the same questions generate_questions will keep, near-duplicates dropped
+        stopping_criteria_factory=lambda prompt_length: question_stopping_criteria(
+            generator.tokenizer, prompt_length, accept=get_question_filter().accepts
+        )
+    )
+
+    # Keys and values for the fixed part of the prompt, computed once per loaded model
+    # (the draft model would need its own cached prefix, so assisted generation goes without)
+    prefix_cache = None
+    if MODEL_BACKEND in PREFIX_CACHE_BACKENDS and not assisted:
+        prefix_cache = PrefixCache(generator.model, generator.tokenizer, QUESTION_PROMPT_PREFIX)
+
+    return {'generator': generator, 'worker': worker, 'prefix_cache': prefix_cache}
+
+
+def release_model_resources(resources):
+    """Stop the worker thread so the unloaded model can be garbage collected"""
+    resources['worker'].close()
+
+
+def get_ai_model_registry():
+    """Process-wide owner of the model for the configured backend"""
+    return get_model_registry(
+        MODEL_BACKEND,
+        build_model_resources,
+        on_unload=release_model_resources,
+        idle_timeout=MODEL_IDLE_UNLOAD
+    )
+
+
+def get_inference_worker():
+    """Get the shared inference worker, loading the model if needed"""
+    if TEMPLATE_ONLY:
+        return None
+    resources = get_ai_model_registry().get()
+    return resources['worker'] if resources else None
+
+
+def get_prefix_cache():
+    """Get the prompt prefix cache of the loaded model, if any"""
+    resources = get_ai_model_registry().peek()
+    return resources['prefix_cache'] if resources else None
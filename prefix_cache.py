@@ -0,0 +1,33 @@
+import copy
+
+import torch
+
+
+class PrefixCache:
+    """Precomputed past_key_values for a fixed prompt prefix, reused across requests
+
+    Prompts starting with the prefix only need their variable suffix encoded;
+    decoding continues from a copy of the cached keys and values.
+    """
+
+    def __init__(self, model, tokenizer, prefix):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.prefix = prefix
+        self.prefix_ids = tokenizer(prefix, return_tensors="pt").input_ids.to(model.device)
+        with torch.no_grad():
+            self.past_key_values = model(self.prefix_ids, use_cache=True).past_key_values
+
+    def prepare(self, prompt):
+        """Build generate() inputs for prompt, continuing from the cached prefix when it applies"""
+        if not prompt.startswith(self.prefix) or len(prompt) == len(self.prefix):
+            return dict(self.tokenizer(prompt, return_tensors="pt").to(self.model.device))
+
+        suffix_ids = self.tokenizer(prompt[len(self.prefix):], return_tensors="pt").input_ids.to(self.model.device)
+        input_ids = torch.cat([self.prefix_ids, suffix_ids], dim=1)
+        return {
+            'input_ids': input_ids,
+            'attention_mask': torch.ones_like(input_ids),
+            # generate() extends the cache as it decodes, so every request gets its own copy
+            'past_key_values': copy.deepcopy(self.past_key_values)
+        }
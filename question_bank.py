@@ -0,0 +1,253 @@
+"""SQLite question bank indexed by skill and experience band
+
+Build a bank from a JSONL file of {"skill", "text", "experience"} records
+(experience is one of junior, mid, senior or any), or seed it from the
+built-in templates:
+
+    python question_bank.py build questions.jsonl question_bank.db
+    python question_bank.py build --from-templates question_bank.db
+
+Rebuilding writes a new file and swaps it in atomically; running apps pick
+it up on their next lookup without a restart.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from question_templates import QUESTION_TEMPLATES
+
+# Experience bands; questions stored with ANY_BAND suit every candidate
+ANY_BAND = -1
+BANDS = {'junior': 0, 'mid': 1, 'senior': 2, 'any': ANY_BAND}
+
+# Read-only pages are mapped into memory, so every worker shares them through the page cache
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    skill TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE UNIQUE INDEX questions_by_group ON questions (skill, band, pos);
+"""
+
+
+def experience_band(years_experience):
+    """Map a 'Years of Experience' choice such as '3-5 years' or '10+ years' to a band"""
+    numbers = re.findall(r"\d+", str(years_experience or ""))
+    if not numbers:
+        return ANY_BAND
+    years = int(numbers[0])
+    if years < 2:
+        return BANDS['junior']
+    if years < 5:
+        return BANDS['mid']
+    return BANDS['senior']
+
+
+def build_question_bank(path, records):
+    """Write records of (skill, band, text) into a fresh bank file at path"""
+    groups = {}
+    seen = set()
+    for skill, band, text in records:
+        key = (skill.lower(), band)
+        if (key, text) not in seen:
+            seen.add((key, text))
+            groups.setdefault(key, []).append(text)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        # pos numbers each (skill, band) group from 0 so random picks are index lookups
+        conn.executemany(
+            "INSERT INTO questions (skill, band, pos, text) VALUES (?, ?, ?, ?)",
+            (
+                (skill, band, pos, text)
+                for (skill, band), questions in groups.items()
+                for pos, text in enumerate(questions)
+            )
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return sum(len(questions) for questions in groups.values())
+
+
+class QuestionBank:
+    """Read-only, memory-mapped view of a question bank file that reloads itself when the file changes"""
+
+    def __init__(self, path, reload_interval=2.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stat = None
+        self._checked = 0.0
+        self._counts = {}
+        self._refresh(force=True)
+
+    def sample(self, skills, years_experience=None, k=5):
+        """Pick up to k distinct questions uniformly across the skills' groups for this experience band"""
+        self._refresh()
+        band = experience_band(years_experience)
+        bands = [ANY_BAND] if band == ANY_BAND else [band, ANY_BAND]
+        counts = self._counts
+        groups = [(skill, b, counts[(skill, b)]) for skill in skills for b in bands if (skill, b) in counts]
+        total = sum(count for _, _, count in groups)
+        if not total:
+            return []
+
+        conn = self._connection()
+        selected = []
+        # The same text can live in several groups, so draw a few extra to cover duplicates
+        for index in random.sample(range(total), min(total, k + 3)):
+            for skill, b, count in groups:
+                if index < count:
+                    break
+                index -= count
+            row = conn.execute(
+                "SELECT text FROM questions WHERE skill = ? AND band = ? AND pos = ?",
+                (skill, b, index)
+            ).fetchone()
+            if row and row[0] not in selected:
+                selected.append(row[0])
+                if len(selected) == k:
+                    break
+        return selected
+
+    def skills(self):
+        self._refresh()
+        return sorted({skill for skill, _ in self._counts})
+
+    @property
+    def version(self):
+        """Increments every time a rebuilt bank file is picked up"""
+        self._refresh()
+        return self._generation
+
+    def all_questions(self):
+        """Every distinct question text in the bank"""
+        self._refresh()
+        return [row[0] for row in self._connection().execute("SELECT DISTINCT text FROM questions")]
+
+    def _refresh(self, force=False):
+        """Reopen the bank if the file was replaced since we last looked"""
+        now = time.time()
+        if not force and now - self._checked < self.reload_interval:
+            return
+        with self._lock:
+            self._checked = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                if force:
+                    raise
+                # Mid-swap or removed; keep serving the bank we have open
+                return
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature == self._stat:
+                return
+            conn = self._open()
+            try:
+                counts = {
+                    (skill, band): count
+                    for skill, band, count in conn.execute(
+                        "SELECT skill, band, COUNT(*) FROM questions GROUP BY skill, band"
+                    )
+                }
+            finally:
+                conn.close()
+            self._counts = counts
+            self._stat = signature
+            # Threads reopen their connection on next use
+            self._generation += 1
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            if getattr(local, 'conn', None) is not None:
+                local.conn.close()
+            local.conn = self._open()
+            local.generation = self._generation
+        return local.conn
+
+    def _open(self):
+        conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+
+_banks = {}
+_banks_lock = threading.Lock()
+
+
+def get_question_bank(path):
+    """Return the process-wide bank for path, or None until a bank file exists there"""
+    with _banks_lock:
+        if path not in _banks:
+            if not os.path.exists(path):
+                return None
+            _banks[path] = QuestionBank(path)
+        return _banks[path]
+
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            experience = str(record.get('experience', 'any')).lower()
+            if experience not in BANDS:
+                raise ValueError(f"{path}:{line_number}: unknown experience {experience!r}")
+            yield record['skill'], BANDS[experience], record['text']
+
+
+def _template_records():
+    for skill, questions in QUESTION_TEMPLATES.items():
+        for text in questions:
+            yield skill, ANY_BAND, text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a HireBuddy question bank")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="build a bank file")
+    build.add_argument("source", nargs="?", help="JSONL file of questions")
+    build.add_argument("output", help="bank file to write")
+    build.add_argument("--from-templates", action="store_true", help="include the built-in template questions")
+    args = parser.parse_args(argv)
+
+    if not args.source and not args.from_templates:
+        parser.error("give a JSONL source and/or --from-templates")
+
+    def records():
+        if args.from_templates:
+            yield from _template_records()
+        if args.source:
+            yield from _read_jsonl(args.source)
+
+    start = time.perf_counter()
+    count = build_question_bank(args.output, records())
+    print(f"Wrote {count} questions to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
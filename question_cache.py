@@ -0,0 +1,129 @@
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Default location of the on-disk cache (override with HIREBUDDY_QUESTION_CACHE)
+DEFAULT_CACHE_PATH = os.path.join(".hirebuddy_cache", "questions.json")
+
+
+def normalize_tech_stack(tech_stack):
+    """Normalize a free-text tech stack so equivalent stacks share a cache key"""
+    # "+", "#" and "&" belong to names like "C++", "C#" and "R&D", so they never split skills
+    parts = re.split(r"[,;/|\n]+|\s+and\s+", tech_stack.lower())
+    skills = set()
+    for part in parts:
+        part = " ".join(part.split())
+        if part:
+            skills.add(part)
+    return ",".join(sorted(skills))
+
+
+def make_cache_key(tech_stack, years_experience, job_role):
+    """Build the cache key for a candidate profile"""
+    return "|".join([
+        normalize_tech_stack(tech_stack),
+        " ".join(str(years_experience).lower().split()),
+        " ".join(str(job_role).lower().split()),
+    ])
+
+
+class QuestionCache:
+    """LRU + TTL cache holding a small pool of question-set variants per profile"""
+
+    def __init__(self, path=None, max_entries=500, variants_per_key=3, ttl_seconds=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.variants_per_key = variants_per_key
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self._load()
+
+    def get(self, key):
+        """Return a random cached variant for key, or None when more variants are needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            # Keep generating until the pool is full so candidates don't all get the same set
+            if len(entry['variants']) < self.variants_per_key:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(random.choice(entry['variants']))
+
+    def put(self, key, questions):
+        """Add a generated question set to the pool for key"""
+        if not questions:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                entry = {'created': time.time(), 'variants': []}
+                self._entries[key] = entry
+
+            variants = entry['variants']
+            if list(questions) not in variants:
+                variants.append(list(questions))
+            # Oldest variant makes room for the newest one
+            del variants[:-self.variants_per_key]
+
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            if self.path:
+                self._save()
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                self._save()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, entry):
+        return self.ttl_seconds is not None and time.time() - entry['created'] > self.ttl_seconds
+
+    def _load(self):
+        """Warm the cache from disk, skipping expired entries"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, entry in data.get('entries', []):
+            if not self._expired(entry):
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        """Atomically write the cache to disk (caller holds the lock)"""
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({'entries': list(self._entries.items())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # A read-only disk shouldn't break interviews; the cache stays in memory
+            pass
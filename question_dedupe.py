@@ -0,0 +1,132 @@
+import functools
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from question_templates import QUESTION_TEMPLATES
+
+# Hashed feature space; small enough that a bank of tens of thousands of questions stays a few tens of MB
+DIMENSIONS = 1024
+
+# Cosine similarity above which two questions count as the same question
+DEFAULT_THRESHOLD = 0.75
+
+STOPWORDS = frozenset("""
+a an and are as at be between can could difference do does for from how i if in into is it its
+me of on or so that the their them there these this to use using we what when where which who
+why will with would you your yourself explain describe tell walk through example examples
+s let lets start begin talk discuss each now next some
+""".split())
+
+_NUMBERING_RE = re.compile(r"^\s*\d+[.)]\s*")
+# Leading interjections such as "Great!" or "Hello!" say nothing about the question itself
+_INTERJECTION_RE = re.compile(r"^(?:[^.!?]{0,20}!\s*)+")
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Bigrams catch shared phrasing but shouldn't outweigh shared content words
+BIGRAM_WEIGHT = 0.5
+
+
+def question_features(question):
+    """(feature, weight) pairs for a question's content words and word bigrams"""
+    text = _INTERJECTION_RE.sub("", _NUMBERING_RE.sub("", question)).lower()
+    words = [word for word in _WORD_RE.findall(text) if word not in STOPWORDS]
+    return [(word, 1.0) for word in words] + [(f"{a} {b}", BIGRAM_WEIGHT) for a, b in zip(words, words[1:])]
+
+
+def sparse_vectorize(questions, dimensions=DIMENSIONS):
+    """L2-normalized signed feature-hashing vectors as (rows, cols, values), one entry per nonzero"""
+    rows, cols, values = [], [], []
+    for row, question in enumerate(questions):
+        for feature, weight in question_features(question):
+            h = zlib.crc32(feature.encode("utf-8"))
+            rows.append(row)
+            cols.append(h % dimensions)
+            # The sign bit keeps hash collisions from only ever adding up
+            values.append(weight if h & 0x80000000 else -weight)
+
+    # Features hashed to the same column add up into one entry
+    keys, inverse = np.unique(np.array(rows, dtype=np.int64) * dimensions + np.array(cols, dtype=np.int64),
+                              return_inverse=True)
+    values = np.bincount(inverse, weights=values, minlength=len(keys)).astype(np.float32)
+    rows, cols = keys // dimensions, keys % dimensions
+    norms = np.sqrt(np.bincount(rows, weights=np.square(values), minlength=len(questions))).astype(np.float32)
+    np.divide(values, norms[rows], out=values, where=norms[rows] > 0)
+    return rows, cols, values
+
+
+def vectorize(questions, dimensions=DIMENSIONS):
+    """L2-normalized signed feature-hashing vectors, one row per question"""
+    rows, cols, values = sparse_vectorize(questions, dimensions)
+    matrix = np.zeros((len(questions), dimensions), dtype=np.float32)
+    matrix[rows, cols] = values
+    return matrix
+
+
+@functools.lru_cache(maxsize=4096)
+def _question_vector(question, dimensions):
+    # Accepted questions are compared again for every later candidate, and the stopping
+    # criterion and the final parse check the same questions, so vectors are reused
+    vector = vectorize([question], dimensions)[0]
+    vector.flags.writeable = False
+    return vector
+
+
+class DuplicateFilter:
+    """Rejects questions that are near-duplicates of each other or of the question bank
+
+    The bank is held as an inverted index from hashed feature to the bank
+    questions that have it, about 8 bytes per feature instead of a dense
+    row of DIMENSIONS floats per question, so even a bank of tens of
+    thousands of questions costs each process only a few MB.
+    """
+
+    def __init__(self, bank_questions, threshold=DEFAULT_THRESHOLD, dimensions=DIMENSIONS):
+        self.threshold = threshold
+        self.dimensions = dimensions
+        rows, cols, values = sparse_vectorize(list(bank_questions), dimensions)
+        order = np.argsort(cols, kind="stable")
+        self._bank_rows = rows[order].astype(np.int32)
+        self._bank_values = values[order]
+        # Entries of column c are _bank_rows/_bank_values[_bank_offsets[c]:_bank_offsets[c + 1]]
+        self._bank_offsets = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=dimensions))))
+
+    def accepts(self, question, accepted):
+        """Whether question is neither too similar to the bank nor to any of the accepted questions"""
+        vector = _question_vector(question, self.dimensions)
+        if self._bank_similarity(vector) >= self.threshold:
+            return False
+        return all(_question_vector(q, self.dimensions) @ vector < self.threshold for q in accepted)
+
+    def _bank_similarity(self, vector):
+        """Highest cosine similarity between vector and a bank question, reading only its features' columns"""
+        cols = np.flatnonzero(vector)
+        starts, ends = self._bank_offsets[cols], self._bank_offsets[cols + 1]
+        if not (ends - starts).any():
+            return 0.0
+        index = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        weights = self._bank_values[index] * np.repeat(vector[cols], ends - starts)
+        return np.bincount(self._bank_rows[index], weights=weights).max()
+
+
+_filters = {}
+_filters_lock = threading.Lock()
+
+
+def get_duplicate_filter(bank=None, threshold=DEFAULT_THRESHOLD):
+    """Process-wide filter for the question bank (or the built-in templates), rebuilt when the bank reloads"""
+    key = ('bank', id(bank), bank.version, threshold) if bank is not None else ('templates', threshold)
+    with _filters_lock:
+        duplicate_filter = _filters.get(key)
+        if duplicate_filter is None:
+            if bank is not None:
+                questions = bank.all_questions()
+            else:
+                questions = [q for questions in QUESTION_TEMPLATES.values() for q in questions]
+            duplicate_filter = DuplicateFilter(questions, threshold=threshold)
+            # Only the current bank version is worth keeping
+            _filters.clear()
+            _filters[key] = duplicate_filter
+        return duplicate_filter
@@ -0,0 +1,83 @@
+NUM_QUESTIONS = 5
+
+# The profile fields come last, so everything before them is one fixed block
+QUESTION_PROMPT = """Generate 5 technical interview questions for the candidate below.
+Create diverse, practical questions that match their experience level. Make them conversational and interview-appropriate.
+
+Candidate:
+- Technical Stack: {tech_stack}
+- Years of Experience: {years_experience}
+- Job Role: {job_role}
+
+Questions:"""
+
+# Static part of the prompt shared by every candidate, up to the first profile field
+QUESTION_PROMPT_PREFIX = QUESTION_PROMPT.split("{tech_stack}")[0].rstrip(" ")
+
+# Lines mentioning these words are usually the model echoing the prompt
+PROMPT_ECHO_WORDS = ['generate', 'questions', 'candidate', 'technical', 'interview']
+NUMBERED_PREFIXES = ('1.', '2.', '3.', '4.', '5.')
+
+
+def build_question_prompt(tech_stack, years_experience, job_role):
+    """Create a detailed prompt based on candidate profile"""
+    return QUESTION_PROMPT.format(
+        tech_stack=tech_stack,
+        years_experience=years_experience,
+        job_role=job_role
+    )
+
+
+class QuestionParser:
+    """Incrementally extract interview questions from generated text, line by line"""
+
+    def __init__(self, prompt_header=QUESTION_PROMPT.split('\n')[0], limit=NUM_QUESTIONS, accept=None):
+        self.prompt_header = prompt_header
+        self.limit = limit
+        # Optional accept(question, questions_so_far) hook, e.g. a near-duplicate filter
+        self.accept = accept
+        self.questions = []
+        self._buffer = ""
+
+    @property
+    def complete(self):
+        return len(self.questions) >= self.limit
+
+    def feed(self, text):
+        """Add decoded text and return the questions completed by it"""
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._parse_lines(lines)
+
+    def close(self):
+        """Flush the trailing partial line and return any question it holds"""
+        line, self._buffer = self._buffer, ""
+        return self._parse_lines([line])
+
+    def _parse_lines(self, lines):
+        added = []
+        for line in lines:
+            if self.complete:
+                break
+            line = line.strip()
+            if line and '?' in line and not line.startswith(self.prompt_header):
+                # Clean up the question
+                if line.startswith(NUMBERED_PREFIXES):
+                    question = line
+                elif not any(q in line.lower() for q in PROMPT_ECHO_WORDS):
+                    question = f"{len(self.questions) + 1}. {line}"
+                else:
+                    continue
+                if self.accept is not None and not self.accept(question, self.questions):
+                    continue
+                self.questions.append(question)
+                added.append(question)
+        return added
+
+
+def extract_questions(generated_text, limit=NUM_QUESTIONS, accept=None):
+    """Extract up to limit questions from a complete generated text"""
+    parser = QuestionParser(limit=limit, accept=accept)
+    parser.feed(generated_text)
+    parser.close()
+    return parser.questions
@@ -0,0 +1,122 @@
+import os
+import random
+
+from question_bank import get_question_bank
+from question_dedupe import get_duplicate_filter
+from metrics import timed
+from model_service import GENERATION_TIME_BUDGET, GENERATION_TIMEOUT, MAX_NEW_TOKENS
+from question_parser import NUM_QUESTIONS, build_question_prompt, extract_questions
+from question_templates import QUESTION_TEMPLATES
+from skill_matcher import match_skills
+
+# Question bank built with question_bank.py; the built-in templates are used until it exists
+QUESTION_BANK_PATH = os.environ.get("HIREBUDDY_QUESTION_BANK", "question_bank.db")
+
+# Generated questions this similar to each other or to a bank question are dropped
+DUPLICATE_THRESHOLD = float(os.environ.get("HIREBUDDY_DUPLICATE_THRESHOLD", "0.75"))
+
+
+def get_question_filter():
+    """Near-duplicate filter over the current question bank (or built-in templates)"""
+    return get_duplicate_filter(get_question_bank(QUESTION_BANK_PATH), threshold=DUPLICATE_THRESHOLD)
+
+
+def get_questions_for_tech_stack(tech_stack, years_experience=None):
+    """Get questions based on tech stack (fallback method)"""
+    with timed("template_questions"):
+        return _questions_for_tech_stack(tech_stack, years_experience)
+
+
+def _questions_for_tech_stack(tech_stack, years_experience):
+    # Find matching tech stacks; skills that only the question bank has count too
+    bank = get_question_bank(QUESTION_BANK_PATH)
+    matched_stacks = ['general'] + [skill for skill in match_skills(tech_stack, bank) if skill != 'general']
+
+    # Sample straight from the question bank's index when one is installed
+    if bank is not None:
+        selected = bank.sample(matched_stacks, years_experience, k=NUM_QUESTIONS)
+        if len(selected) >= NUM_QUESTIONS:
+            return selected
+        # A small bank (or one with few questions for this band) is topped up from the templates
+        # (drawing extra to cover any the bank already picked)
+        for question in _template_questions(matched_stacks, k=NUM_QUESTIONS + len(selected)):
+            if len(selected) == NUM_QUESTIONS:
+                break
+            if question not in selected:
+                selected.append(question)
+        return selected
+
+    return _template_questions(matched_stacks)
+
+
+def _template_questions(matched_stacks, k=5):
+    matched_stacks = [stack for stack in matched_stacks if stack in QUESTION_TEMPLATES]
+
+    # Collect questions from matched stacks
+    all_questions = []
+    for stack in matched_stacks:
+        all_questions.extend(QUESTION_TEMPLATES[stack])
+
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_questions = []
+    for q in all_questions:
+        if q not in seen:
+            seen.add(q)
+            unique_questions.append(q)
+
+    # Randomly select k questions
+    if len(unique_questions) >= k:
+        selected = random.sample(unique_questions, k)
+    else:
+        selected = unique_questions
+
+    return selected
+
+
+def pad_with_template_questions(questions, tech_stack, years_experience=None):
+    """If we don't have enough questions, fill with template questions"""
+    questions = list(questions)
+    if len(questions) < NUM_QUESTIONS:
+        template_questions = get_questions_for_tech_stack(tech_stack, years_experience)
+        for tq in template_questions:
+            if len(questions) < NUM_QUESTIONS:
+                questions.append(tq)
+
+    return questions[:NUM_QUESTIONS]
+
+
+def generate_questions(tech_stack, years_experience, job_role, ai_model):
+    """Generate questions with the model, dropping near-duplicates and padding from the templates
+
+    Errors from the model, including a TimeoutError after GENERATION_TIMEOUT,
+    are left to the caller.
+    """
+    questions = generate_model_questions(tech_stack, years_experience, job_role, ai_model)
+    return pad_with_template_questions(questions, tech_stack, years_experience)
+
+
+def generate_model_questions(tech_stack, years_experience, job_role, ai_model):
+    """Only the questions the model produced, near-duplicates dropped and not padded (possibly none)"""
+    prompt = build_question_prompt(tech_stack, years_experience, job_role)
+
+    # Generate questions using AI
+    response = ai_model(
+        prompt,
+        timeout=GENERATION_TIMEOUT,
+        max_new_tokens=MAX_NEW_TOKENS,
+        max_time=GENERATION_TIME_BUDGET,
+        num_return_sequences=1,
+        # Parse only the continuation, exactly the text the stopping criterion counted questions in
+        return_full_text=False,
+        temperature=0.8,
+        top_p=0.9,
+        do_sample=True
+    )
+
+    generated_text = response[0]['generated_text']
+
+    # Extract questions from generated text, with the same limit and duplicate filter
+    # the stopping criterion counted them with
+    with timed("parse"):
+        return extract_questions(generated_text, accept=get_question_filter().accepts)
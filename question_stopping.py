@@ -0,0 +1,53 @@
+from transformers import StoppingCriteria, StoppingCriteriaList
+
+from question_parser import NUM_QUESTIONS, QuestionParser
+
+
+class QuestionStoppingCriteria(StoppingCriteria):
+    """Stop generation as soon as every sequence in the batch holds enough usable questions
+
+    The decoded continuation is run through the same extraction rules as
+    extract_questions, one completed line at a time. limit and accept must
+    match the parser that consumes the output, or generation stops before
+    it has what it needs.
+    """
+
+    def __init__(self, tokenizer, prompt_length, limit=NUM_QUESTIONS, accept=None):
+        self.tokenizer = tokenizer
+        # Width of the (padded) prompt in input_ids; assisted decoding appends several
+        # tokens per step, so it can't be inferred from the first call
+        self.prompt_length = prompt_length
+        self.limit = limit
+        self.accept = accept
+        self._parsers = None
+        self._consumed = None
+        self._checked = None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self._parsers is None:
+            self._parsers = [QuestionParser(limit=self.limit, accept=self.accept) for _ in range(input_ids.shape[0])]
+            self._consumed = [0] * input_ids.shape[0]
+            self._checked = [self.prompt_length] * input_ids.shape[0]
+
+        for row, ids in enumerate(input_ids):
+            parser = self._parsers[row]
+            if parser.complete:
+                continue
+            # Questions only complete on a newline, so skip the full decode unless one of
+            # the tokens added since the last call holds one
+            new_ids, self._checked[row] = ids[self._checked[row]:], ids.shape[0]
+            if '\n' not in self.tokenizer.decode(new_ids):
+                continue
+
+            text = self.tokenizer.decode(ids[self.prompt_length:], skip_special_tokens=True)
+            end = text.rfind('\n') + 1
+            if end > self._consumed[row]:
+                parser.feed(text[self._consumed[row]:end])
+                self._consumed[row] = end
+
+        return all(parser.complete for parser in self._parsers)
+
+
+def question_stopping_criteria(tokenizer, prompt_length, limit=NUM_QUESTIONS, accept=None):
+    """Build a fresh stopping criteria list for one generate call over prompt_length-token inputs"""
+    return StoppingCriteriaList([QuestionStoppingCriteria(tokenizer, prompt_length, limit=limit, accept=accept)])
@@ -0,0 +1,105 @@
+import contextlib
+import threading
+
+from metrics import increment, timed
+from question_parser import QuestionParser
+
+
+class QuestionStream:
+    """Generate questions on a background thread, publishing each one as soon as its line is decoded
+
+    stopping_criteria_factory, if given, is called with the prompt length
+    in tokens once the prompt is tokenized. generate_slots, if given, is a
+    semaphore held while decoding, which caps how many generate() calls
+    share the model at once.
+    """
+
+    def __init__(self, generator, prompt, on_complete=None, prefix_cache=None, accept=None,
+                 stopping_criteria_factory=None, generate_slots=None, **generate_kwargs):
+        self.generator = generator
+        self.prompt = prompt
+        self.prefix_cache = prefix_cache
+        self.on_complete = on_complete
+        self.stopping_criteria_factory = stopping_criteria_factory
+        self.generate_slots = generate_slots
+        self.generate_kwargs = generate_kwargs
+        self.parser = QuestionParser(accept=accept)
+        self.error = None
+        self.done = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="hirebuddy-question-stream", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def questions(self):
+        with self._condition:
+            return list(self.parser.questions)
+
+    def wait_for(self, count, timeout=None):
+        """Block until count questions exist or generation ends, then return what we have"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.done or len(self.parser.questions) >= count,
+                timeout=timeout
+            )
+            return list(self.parser.questions)
+
+    def _publish(self, text):
+        with self._condition, timed("parse_chunk"):
+            if self.parser.feed(text):
+                self._condition.notify_all()
+            return self.parser.complete
+
+    def _run(self):
+        decode_thread = None
+        try:
+            # Setup failures must still mark the stream done, or waiting sessions never wake up
+            from transformers import TextIteratorStreamer
+
+            tokenizer = self.generator.tokenizer
+            model = self.generator.model
+            streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+            with timed("tokenize"):
+                if self.prefix_cache is not None:
+                    inputs = self.prefix_cache.prepare(self.prompt)
+                else:
+                    inputs = dict(tokenizer(self.prompt, return_tensors="pt").to(model.device))
+            generate_kwargs = dict(self.generate_kwargs)
+            if self.stopping_criteria_factory is not None:
+                generate_kwargs['stopping_criteria'] = self.stopping_criteria_factory(inputs['input_ids'].shape[1])
+            decode_thread = threading.Thread(
+                target=self._decode,
+                args=(model, inputs, streamer, generate_kwargs),
+                name="hirebuddy-question-decode",
+                daemon=True
+            )
+            decode_thread.start()
+
+            for text in streamer:
+                self._publish(text)
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+        finally:
+            if decode_thread is not None:
+                decode_thread.join()
+            with self._condition:
+                self.parser.close()
+                self.done = True
+                self._condition.notify_all()
+
+        if self.on_complete and self.error is None:
+            self.on_complete(self.questions)
+
+    def _decode(self, model, inputs, streamer, generate_kwargs):
+        try:
+            with self.generate_slots or contextlib.nullcontext(), timed("decode"):
+                output = model.generate(**inputs, streamer=streamer, **generate_kwargs)
+            increment("generated_tokens_total", output.shape[-1] - inputs['input_ids'].shape[-1])
+        except Exception as e:
+            self.error = e
+            # Unblock the consumer loop
+            streamer.end()
@@ -0,0 +1,66 @@
+# Enhanced question templates (fallback)
+QUESTION_TEMPLATES = {
+    'python': [
+        "Hello! Let's start with Python. Can you explain the difference between lists and tuples in Python? When would you use each?",
+        "Great! Now, how do you handle exceptions in Python? Can you walk me through a try-except block example?",
+        "Interesting! What are Python decorators? Can you show me how to create a custom decorator?",
+        "Excellent! Explain the concept of list comprehensions. Can you write a comprehension that filters even numbers?",
+        "Perfect! How does Python's garbage collection work? What are some memory management best practices you follow?"
+    ],
+    'mysql': [
+        "Hello! Let's discuss databases. Can you explain the difference between INNER JOIN and LEFT JOIN? When would you use each?",
+        "Good! What are database indexes? How do they improve query performance in MySQL?",
+        "Nice! Explain database normalization. What are the different normal forms and why are they important?",
+        "Excellent! What are stored procedures in MySQL? When would you use them over regular queries?",
+        "Great! How do you optimize a slow-running MySQL query? What tools and techniques do you use?"
+    ],
+    'nlp': [
+        "Hello! Let's talk about NLP. Can you explain the difference between stemming and lemmatization?",
+        "Interesting! What are word embeddings? How do Word2Vec and GloVe differ in their approaches?",
+        "Great! Explain the concept of TF-IDF. How is it calculated and when would you use it?",
+        "Excellent! What are n-grams? How do you choose the right n-gram size for different tasks?",
+        "Perfect! Explain sentiment analysis. What approaches would you use for different types of text?"
+    ],
+    'javascript': [
+        "Hello! Let's start with JavaScript. Can you explain the difference between var, let, and const?",
+        "Good! What are closures in JavaScript? Can you provide a practical example of how you'd use them?",
+        "Interesting! How does the event loop work in JavaScript? Can you explain the call stack?",
+        "Great! Explain promises and async/await. How do they differ from traditional callbacks?",
+        "Excellent! What are the differences between == and === in JavaScript? Why is this important?"
+    ],
+    'react': [
+        "Hello! Let's discuss React. Can you explain the component lifecycle? What are the key lifecycle methods?",
+        "Good! What are React hooks? Can you compare useState and useEffect with examples?",
+        "Interesting! How do you manage state in React applications? What's your approach?",
+        "Great! Explain the difference between props and state in React. When do you use each?",
+        "Excellent! What is the Virtual DOM? How does React's reconciliation process work?"
+    ],
+    'aws': [
+        "Hello! Let's talk about AWS. Can you explain the difference between EC2 and Lambda services? When would you use each?",
+        "Good! How would you design a scalable web application on AWS? What services would you include?",
+        "Interesting! What are the different storage options in AWS? Compare S3, EBS, and EFS.",
+        "Great! Explain auto-scaling in AWS. How do you configure it for different scenarios?",
+        "Excellent! How do you ensure security in AWS applications? What services and best practices do you use?"
+    ],
+    'java': [
+        "Hello! Let's discuss Java. Can you explain the main concepts of object-oriented programming in Java?",
+        "Good! What's the difference between abstract classes and interfaces in Java? When would you use each?",
+        "Interesting! How does garbage collection work in Java? What are the different GC algorithms?",
+        "Great! Explain multithreading in Java. How do you handle thread safety in your applications?",
+        "Excellent! What are design patterns in Java? Can you explain the Singleton pattern and its use cases?"
+    ],
+    'sql': [
+        "Hello! Let's talk about SQL. Can you explain the difference between INNER JOIN and LEFT JOIN? When would you use each?",
+        "Good! What are database indexes? How do they improve query performance?",
+        "Interesting! Explain database normalization. What are the different normal forms?",
+        "Great! What are stored procedures? When would you use them over regular queries?",
+        "Excellent! How do you optimize a slow-running SQL query? What's your systematic approach?"
+    ],
+    'general': [
+        "Hello! Let's start with a general question. Can you walk me through a challenging project you've worked on? What made it difficult?",
+        "Interesting! How do you approach debugging a complex issue? What's your systematic process?",
+        "Great! Explain your experience with version control. How do you manage code collaboration in a team?",
+        "Good! What's your approach to code testing? How do you ensure quality in your projects?",
+        "Excellent! How do you stay updated with the latest developments in your field? What resources do you use?"
+    ]
+}
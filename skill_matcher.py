@@ -0,0 +1,105 @@
+import re
+import threading
+
+# Canonical skill -> spellings and synonyms candidates use for it; words that are
+# common outside the skill ("lambda", "spring", "oracle", "node") only count with a qualifier
+SKILL_ALIASES = {
+    'python': ['python', 'python3', 'py', 'django', 'flask', 'fastapi', 'pandas'],
+    'mysql': ['mysql', 'mariadb'],
+    'sql': ['sql', 'postgres', 'postgresql', 'psql', 'sqlite', 'tsql', 't-sql', 'ms sql', 'mssql',
+            'sql server', 'oracle database', 'oracle db', 'plsql'],
+    'nlp': ['nlp', 'natural language processing', 'spacy', 'nltk', 'text mining', 'llm', 'llms'],
+    'javascript': ['javascript', 'js', 'ecmascript', 'es6', 'typescript', 'ts', 'nodejs', 'node.js', 'node js'],
+    'react': ['react', 'reactjs', 'react.js', 'react native', 'redux', 'next.js', 'nextjs'],
+    'aws': ['aws', 'amazon web services', 'ec2', 's3', 'aws lambda', 'cloudformation'],
+    'java': ['java', 'jvm', 'spring boot', 'spring framework', 'j2ee', 'jakarta ee'],
+}
+
+GREETINGS = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings']
+ENDINGS = ['bye', 'goodbye', 'thank you', 'thanks', 'see you', 'see ya', 'farewell']
+# Everyday words in technical answers ("the front end", "exit code"), so only the whole message counts
+ENDING_COMMANDS = ['end', 'quit', 'exit', 'stop', 'end interview', 'end the interview']
+
+# Words keep +, # and inner dots/dashes so "c++", "node.js" and "t-sql" stay whole
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[.-][a-z0-9+#]+)*")
+_STRIP_SEPARATORS = str.maketrans("", "", ".-")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens, dropping inner separators ("react.js" -> "reactjs")"""
+    return [token.translate(_STRIP_SEPARATORS) for token in _TOKEN_RE.findall(text.lower())]
+
+
+class PhraseMatcher:
+    """Whole-word phrase index mapping free text to canonical labels in a single pass
+
+    Phrases are tokenized the same way as the text, so "React.js", "reactjs"
+    and "ReactJS" all hit the same entry, while "java" no longer fires
+    inside "javascript" and "end" no longer fires inside "recommend".
+    """
+
+    def __init__(self, phrases_by_label):
+        # First token -> [(remaining tokens, label)], longest phrases first
+        self._index = {}
+        for label, phrases in phrases_by_label.items():
+            for phrase in phrases:
+                tokens = tokenize(phrase)
+                if tokens:
+                    self._index.setdefault(tokens[0], []).append((tuple(tokens[1:]), label))
+        for candidates in self._index.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def find(self, text):
+        """Return the matched labels in order of first appearance"""
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            candidates = self._index.get(tokens[i])
+            if candidates is None:
+                # Fall back to the unversioned word ("python310" -> "python")
+                candidates = self._index.get(tokens[i].rstrip("0123456789"), ())
+            i += 1
+            for rest, label in candidates:
+                # Prefer the longest phrase starting here ("react native" over "react")
+                if not rest or tuple(tokens[i:i + len(rest)]) == rest:
+                    found.setdefault(label, None)
+                    i += len(rest)
+                    break
+        return list(found)
+
+    def matches(self, text):
+        return bool(self.find(text))
+
+
+SKILL_MATCHER = PhraseMatcher(SKILL_ALIASES)
+GREETING_MATCHER = PhraseMatcher({'greeting': GREETINGS})
+ENDING_MATCHER = PhraseMatcher({'ending': ENDINGS})
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_skill_matcher(bank=None):
+    """Skill matcher that also knows every skill in the question bank, rebuilt when the bank reloads"""
+    if bank is None:
+        return SKILL_MATCHER
+    key = (id(bank), bank.version)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is None:
+            # A bank skill is matched by its own name, plus the aliases if it is a known one
+            phrases = {skill: [skill] + SKILL_ALIASES.get(skill, []) for skill in bank.skills()}
+            for skill, aliases in SKILL_ALIASES.items():
+                phrases.setdefault(skill, aliases)
+            matcher = PhraseMatcher(phrases)
+            # Only the current bank version is worth keeping
+            _matchers.clear()
+            _matchers[key] = matcher
+        return matcher
+
+
+def match_skills(tech_stack, bank=None):
+    """Map a free-text tech stack to canonical skills (and the question bank's skills, if given)"""
+    return get_skill_matcher(bank).find(tech_stack)
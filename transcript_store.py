@@ -0,0 +1,185 @@
+"""Append-only interview transcript store (SQLite in WAL mode)
+
+Messages are queued by the interview and written by a single background
+thread in batches, so a chat turn never waits on disk. Reads flush first, so
+they always see every message appended before them.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    message TEXT NOT NULL,
+    type TEXT NOT NULL,
+    is_question INTEGER NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS questions_by_session ON messages (session_id, is_question, seq);
+"""
+
+_STOP = object()
+
+
+def is_question(sender, message):
+    """The messages 'Review Answers' lists: bot turns that ask something"""
+    return sender == 'Bot' and '?' in message
+
+
+class TranscriptStore:
+    """Batched, append-only transcript log shared by every session in the process"""
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._open()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._closed = False
+        self.error = None
+        self._writer = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, session_id, seq, sender, message, message_type="normal"):
+        """Queue one message for writing"""
+        if self._closed:
+            raise RuntimeError("TranscriptStore is closed")
+        self._queue.put((
+            session_id, seq, sender, message, message_type,
+            int(is_question(sender, message)), time.time()
+        ))
+
+    def flush(self, timeout=None):
+        """Block until everything appended so far is on disk"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def page(self, session_id, before_seq=None, limit=20):
+        """Up to limit messages preceding before_seq (or the latest ones), oldest first"""
+        self.flush()
+        if before_seq is None:
+            before_seq = 1 << 62
+        rows = self._connection().execute(
+            "SELECT seq, sender, message, type FROM messages "
+            "WHERE session_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+            (session_id, before_seq, limit)
+        ).fetchall()
+        return [
+            {'seq': seq, 'sender': sender, 'message': message, 'type': message_type}
+            for seq, sender, message, message_type in reversed(rows)
+        ]
+
+    def questions(self, session_id):
+        """(seq, message) for every question asked in the session, from the index"""
+        self.flush()
+        return self._connection().execute(
+            "SELECT seq, message FROM messages WHERE session_id = ? AND is_question = 1 ORDER BY seq",
+            (session_id,)
+        ).fetchall()
+
+    def count(self, session_id):
+        self.flush()
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def close(self):
+        """Write out anything pending and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _run(self):
+        conn = self._open()
+        try:
+            stop = False
+            while not stop:
+                batch, events = [], []
+                stop = self._take(self._queue.get(), batch, events)
+                # Gather whatever arrives within the flush interval into one transaction;
+                # a flush request ends the wait early but still takes what is already queued
+                deadline = time.monotonic() + self.flush_interval
+                while not stop and len(batch) < self.batch_size:
+                    timeout = 0 if events else deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    stop = self._take(item, batch, events)
+
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(
+                                "INSERT OR REPLACE INTO messages "
+                                "(session_id, seq, sender, message, type, is_question, created) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                batch
+                            )
+                    except sqlite3.Error as e:
+                        # Losing a batch of transcript must not stall the interviews writing it
+                        self.error = e
+                for event in events:
+                    event.set()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _take(item, batch, events):
+        """Sort a queued item into the batch or the flush waiters; True for the stop sentinel"""
+        if item is _STOP:
+            return True
+        if isinstance(item, threading.Event):
+            events.append(item)
+        else:
+            batch.append(item)
+        return False
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL keeps readers off the writer's back; NORMAL only risks the last batch on power loss
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_transcript_store(path):
+    """Return the process-wide transcript store for path, flushed at interpreter exit"""
+    with _stores_lock:
+        if path not in _stores:
+            store = TranscriptStore(path)
+            atexit.register(store.close)
+            _stores[path] = store
+        return _stores[path]